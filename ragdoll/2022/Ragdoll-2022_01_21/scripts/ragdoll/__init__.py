@@ -1,6 +1,7 @@
 # State
 __ = type("internal", (object,), {})
 __.installed = False
+__.headless = False
 __.menu = None
 __.menuitems = {}
 __.actiontokey = {}
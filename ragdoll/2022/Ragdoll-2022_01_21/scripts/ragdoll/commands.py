@@ -149,7 +149,7 @@ def assign_markers(transforms, solver, opts=None):
                 )
 
     markers = list()
-    with cmdx.DGModifier() as dgmod:
+    with cmdx.DGModifier(debug=False) as dgmod:
         for index, transform in enumerate(transforms):
             name = "rMarker_%s" % transform.name()
             marker = nodes.create("rdMarker", dgmod, name=name)
@@ -386,6 +386,7 @@ def auto_limit(mod, marker):
         mod.set_attr(marker["limitRangeZ"], cmdx.radians(45))
 
 
+@internal.with_timing
 def cache(solvers):
     """Persistently store the simulated result of the `solvers`
 
@@ -445,6 +446,7 @@ def cache(solvers):
             elif frame > start_frames[solver]:
                 solver["currentState"].read()
 
+        internal.count_frames("commands.cache", 1)
         percentage = 100 * float(frame - start_frame) / total
         yield percentage
 
@@ -1,5 +1,14 @@
 import os
 
+
+def _getenv_float(name, default):
+    """Read a number from the environment, ignoring what isn't one"""
+    try:
+        return float(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
 # Environment variables
 RAGDOLL_DEVELOPER = bool(os.getenv("RAGDOLL_DEVELOPER"))
 RAGDOLL_PLUGIN = os.getenv("RAGDOLL_PLUGIN", "ragdoll")
@@ -8,6 +17,10 @@ RAGDOLL_NO_STARTUP_DIALOG = bool(os.getenv("RAGDOLL_NO_STARTUP_DIALOG"))
 RAGDOLL_AUTO_SERIAL = os.getenv("RAGDOLL_AUTO_SERIAL")
 RAGDOLL_NO_TELEMETRY = bool(os.getenv("RAGDOLL_NO_TELEMETRY"))
 RAGDOLL_TELEMETRY = bool(os.getenv("RAGDOLL_TELEMETRY"))
+RAGDOLL_HEADLESS = bool(os.getenv("RAGDOLL_HEADLESS"))
+RAGDOLL_TELEMETRY_URL = os.getenv("RAGDOLL_TELEMETRY_URL")
+RAGDOLL_TELEMETRY_TIMEOUT = _getenv_float("RAGDOLL_TELEMETRY_TIMEOUT", 2.0)
+RAGDOLL_PROGRESS_INTERVAL = _getenv_float("RAGDOLL_PROGRESS_INTERVAL", 0.1)
 
 CREATE_NEW_SOLVER = 0
 
@@ -43,11 +43,10 @@ import contextlib
 from maya import cmds
 from maya.utils import MayaGuiLogHandler
 from maya.api import OpenMaya as om
-from .vendor import cmdx, qargparse
+from .vendor import cmdx
 from . import (
     commands,
     upgrade,
-    ui,
     options,
     licence,
     dump,
@@ -58,66 +57,82 @@ from . import (
     __
 )
 
-# Backwards compatibility
-from .legacy.interactive import (
-    export_physics as legacy_export_physics,
-    export_physics_options as legacy_export_physics_options,
-    import_physics_options as legacy_import_physics_options,
-    import_physics_from_file as legacy_import_physics_from_file,
-    create_active_rigid as legacy_create_active_rigid,
-    create_active_chain as legacy_create_active_chain,
-    create_chain_options as legacy_create_chain_options,
-    create_passive_rigid as legacy_create_passive_rigid,
-    create_passive_options as legacy_create_passive_options,
-    create_muscle as legacy_create_muscle,
-    create_muscle_options as legacy_create_muscle_options,
-    create_point_constraint as legacy_create_point_constraint,
-    create_orient_constraint as legacy_create_orient_constraint,
-    create_parent_constraint as legacy_create_parent_constraint,
-    create_hinge_constraint as legacy_create_hinge_constraint,
-    create_socket_constraint as legacy_create_socket_constraint,
-    ignore_contacts_constraint as legacy_ignore_contacts_constraint,
-    create_animation_constraint as legacy_create_animation_constraint,
-    create_animation_constraint_options as legacy_create_anim_cons_options,
-    create_hard_pin as legacy_create_hard_pin,
-    create_hard_pin_options as legacy_create_hard_pin_options,
-    create_soft_pin as legacy_create_soft_pin,
-    create_soft_pin_options as legacy_create_soft_pin_options,
-    create_mimic as legacy_create_mimic,
-    create_mimic_options as legacy_create_mimic_options,
-    create_push_force as legacy_create_push_force,
-    create_push_force_options as legacy_create_push_force_options,
-    create_pull_force as legacy_create_pull_force,
-    create_pull_force_options as legacy_create_pull_force_options,
-    create_uniform_force as legacy_create_uniform_force,
-    create_uniform_force_options as legacy_create_uniform_force_options,
-    create_turbulence_force as legacy_create_turbulence_force,
-    create_turbulence_force_options as legacy_create_turbulence_force_options,
-    create_slice as legacy_create_slice,
-    assign_force as legacy_assign_force,
-    bake_simulation as legacy_bake_simulation,
-    bake_simulation_options as legacy_bake_simulation_options,
-    multiply_selected as legacy_multiply_selected,
-    multiply_selected_options as legacy_multiply_selected_options,
-    create_dynamic_control as legacy_create_dynamic_control,
-    edit_shape as legacy_edit_shape,
-    edit_shape_options as legacy_edit_shape_options,
-    edit_constraint_frames as legacy_edit_constraint_frames,
-    duplicate_selected as legacy_duplicate_selected,
-    transfer_selected as legacy_transfer_selected,
-    replace_mesh as legacy_replace_mesh,
-    replace_mesh_options as legacy_replace_mesh_options,
-    convert_to_polygons as legacy_convert_to_polygons,
-    extract_from_scene as legacy_extract_from_scene,
-    move_to_scene as legacy_move_to_scene,
-    combine_scenes as legacy_combine_scenes,
-    set_initial_state as legacy_set_initial_state,
-    set_initial_state_options as legacy_set_initial_state_options,
-    clear_initial_state as legacy_clear_initial_state,
-    clear_initial_state_options as legacy_clear_initial_state_options,
-    show_constraint_editor as legacy_show_constraint_editor,
-    _constraint_options as _legacy_constraint_options
-)
+# Heavy on Qt, and only needed once there's a user
+ui = i__.lazy_import(".ui")
+qargparse = i__.lazy_import(".vendor.qargparse")
+
+
+def _legacy(name):
+    """Return `name` of legacy.interactive, imported on first call"""
+
+    def legacy(*args, **kwargs):
+        from .legacy import interactive
+        return getattr(interactive, name)(*args, **kwargs)
+
+    legacy.__name__ = name
+    return legacy
+
+
+# Backwards compatibility, imported on first use
+legacy_export_physics = _legacy("export_physics")
+legacy_export_physics_options = _legacy("export_physics_options")
+legacy_import_physics_options = _legacy("import_physics_options")
+legacy_import_physics_from_file = _legacy("import_physics_from_file")
+legacy_create_active_rigid = _legacy("create_active_rigid")
+legacy_create_active_chain = _legacy("create_active_chain")
+legacy_create_chain_options = _legacy("create_chain_options")
+legacy_create_passive_rigid = _legacy("create_passive_rigid")
+legacy_create_passive_options = _legacy("create_passive_options")
+legacy_create_muscle = _legacy("create_muscle")
+legacy_create_muscle_options = _legacy("create_muscle_options")
+legacy_create_point_constraint = _legacy("create_point_constraint")
+legacy_create_orient_constraint = _legacy("create_orient_constraint")
+legacy_create_parent_constraint = _legacy("create_parent_constraint")
+legacy_create_hinge_constraint = _legacy("create_hinge_constraint")
+legacy_create_socket_constraint = _legacy("create_socket_constraint")
+legacy_ignore_contacts_constraint = _legacy("ignore_contacts_constraint")
+legacy_create_animation_constraint = _legacy("create_animation_constraint")
+legacy_create_anim_cons_options = _legacy(
+    "create_animation_constraint_options")
+legacy_create_hard_pin = _legacy("create_hard_pin")
+legacy_create_hard_pin_options = _legacy("create_hard_pin_options")
+legacy_create_soft_pin = _legacy("create_soft_pin")
+legacy_create_soft_pin_options = _legacy("create_soft_pin_options")
+legacy_create_mimic = _legacy("create_mimic")
+legacy_create_mimic_options = _legacy("create_mimic_options")
+legacy_create_push_force = _legacy("create_push_force")
+legacy_create_push_force_options = _legacy("create_push_force_options")
+legacy_create_pull_force = _legacy("create_pull_force")
+legacy_create_pull_force_options = _legacy("create_pull_force_options")
+legacy_create_uniform_force = _legacy("create_uniform_force")
+legacy_create_uniform_force_options = _legacy("create_uniform_force_options")
+legacy_create_turbulence_force = _legacy("create_turbulence_force")
+legacy_create_turbulence_force_options = _legacy(
+    "create_turbulence_force_options")
+legacy_create_slice = _legacy("create_slice")
+legacy_assign_force = _legacy("assign_force")
+legacy_bake_simulation = _legacy("bake_simulation")
+legacy_bake_simulation_options = _legacy("bake_simulation_options")
+legacy_multiply_selected = _legacy("multiply_selected")
+legacy_multiply_selected_options = _legacy("multiply_selected_options")
+legacy_create_dynamic_control = _legacy("create_dynamic_control")
+legacy_edit_shape = _legacy("edit_shape")
+legacy_edit_shape_options = _legacy("edit_shape_options")
+legacy_edit_constraint_frames = _legacy("edit_constraint_frames")
+legacy_duplicate_selected = _legacy("duplicate_selected")
+legacy_transfer_selected = _legacy("transfer_selected")
+legacy_replace_mesh = _legacy("replace_mesh")
+legacy_replace_mesh_options = _legacy("replace_mesh_options")
+legacy_convert_to_polygons = _legacy("convert_to_polygons")
+legacy_extract_from_scene = _legacy("extract_from_scene")
+legacy_move_to_scene = _legacy("move_to_scene")
+legacy_combine_scenes = _legacy("combine_scenes")
+legacy_set_initial_state = _legacy("set_initial_state")
+legacy_set_initial_state_options = _legacy("set_initial_state_options")
+legacy_clear_initial_state = _legacy("clear_initial_state")
+legacy_clear_initial_state_options = _legacy("clear_initial_state_options")
+legacy_show_constraint_editor = _legacy("show_constraint_editor")
+_legacy_constraint_options = _legacy("_constraint_options")
 
 log = logging.getLogger("ragdoll")
 
@@ -155,7 +170,8 @@ def _is_interactive():
     return not _is_standalone()
 
 
-MessageBox = ui.MessageBox
+def MessageBox(*args, **kwargs):
+    return ui.MessageBox(*args, **kwargs)
 
 
 if _is_standalone():
@@ -230,37 +246,46 @@ def with_exception_handling(func):
 # These can be accessed/modified via cmds.optionVar
 # as <prefix><name> where <prefix> is "ragdoll" and are
 # all stored persistently alongside Maya's native preferences
-with open(_resource("options.json")) as f:
-    __.optionvars = json.load(f)
-    __.optionvars.pop("#", None)  # Exclude comments
+__.optionvars = i__.read_json(_resource("options.json"))
+__.optionvars.pop("#", None)  # Exclude comments
 
-    if cmdx.__maya_version__ < 2020:
-        __.optionvars["mimicFreezeTransform"]["enabled"] = False
-        __.optionvars["mimicFreezeTransform"]["default"] = False
+if cmdx.__maya_version__ < 2020:
+    __.optionvars["mimicFreezeTransform"]["enabled"] = False
+    __.optionvars["mimicFreezeTransform"]["default"] = False
 
 
 # Every menu item
-with open(_resource("menu.json")) as f:
-    __.menuitems = json.load(f)
-    __.menuitems.pop("#", None)  # Exclude comments
+__.menuitems = i__.read_json(_resource("menu.json"))
+__.menuitems.pop("#", None)  # Exclude comments
+
 
+def install(headless=None):
+    """Install Ragdoll into Maya
+
+    Arguments:
+        headless (bool, optional): Install only what recording and
+            export needs, skipping the UI, telemetry and default optionvars.
+            Defaults to the RAGDOLL_HEADLESS environment variable.
+
+    """
 
-def install():
     if __.installed:
         return
 
+    if headless is None:
+        headless = c.RAGDOLL_HEADLESS
+
+    if headless:
+        return _install_headless()
+
     options.install()
     install_telemetry() if c.RAGDOLL_TELEMETRY else None
     install_logger()
     install_plugin()
     licence.install(c.RAGDOLL_AUTO_SERIAL)
 
-    options.write("shaderPath", _resource("shaders"))
-    options.write("fontPath", _resource("fonts"))
-    options.write("iconPath", _resource("icons"))
-
     if _is_interactive():
-        telemetry.install()
+        cmds.evalDeferred(telemetry.install)
         install_callbacks()
 
         # Give Maya's GUI a chance to boot up
@@ -301,18 +326,40 @@ def install():
     __.installed = True
 
 
+def _install_headless():
+    """Install for e.g. mayapy on a render farm
+
+    Optionvars are read from the Maya preferences where stored and
+    default otherwise, without storing anything new on every launch.
+
+    """
+
+    with i__.Timer("interactive.install") as timer:
+        options.install(seed=False)
+        install_plugin()
+        licence.install(c.RAGDOLL_AUTO_SERIAL)
+
+    __.installed = True
+    __.headless = True
+
+    log.info("Installed headless in %.2fms" % timer.ms)
+
+
 def uninstall():
     if not __.installed:
         # May have been uninstalled by either the C++ plug-in,
         # or via the Script Editor or userSetup.py etc.
         return
 
-    uninstall_telemetry() if c.RAGDOLL_TELEMETRY else None
-    uninstall_logger()
-    uninstall_menu()
-    uninstall_ui()
+    if not __.headless:
+        uninstall_telemetry() if c.RAGDOLL_TELEMETRY else None
+        uninstall_logger()
+        uninstall_menu()
+        uninstall_ui()
+
     options.uninstall()
     cmdx.uninstall()
+    i__.uninstall_graph_callbacks()
 
     if _is_interactive():
         uninstall_callbacks()
@@ -332,6 +379,7 @@ def uninstall():
             sys.modules.pop(module)
 
     __.installed = False
+    __.headless = False
 
 
 class RagdollGuiLogHandler(MayaGuiLogHandler):
@@ -1604,8 +1652,76 @@ def create_pose_constraint(selection=None, **opts):
     return True
 
 
+class _Progress(object):
+    """Report progress at most once every `interval` seconds
+
+    Every update is a call to Maya's UI, which adds up with one
+    update per frame of a 10,000 frame simulation. A new `step` is
+    always reported, and so is the last update, see flush().
+
+    """
+
+    def __init__(self, progress_bar=None, max_value=100, interval=None):
+        self._progress_bar = progress_bar
+        self._max_value = max_value
+        self._throttle = i__.Throttle(interval)
+        self._logged = 0
+        self._step = None
+        self._pending = None
+
+    def update(self, progress, step=None):
+        """Report `progress` out of 100, return False if cancelled"""
+        force = progress >= 100 or step != self._step
+        self._step = step
+
+        if not self._throttle.ready(force=force):
+            self._pending = (progress, step)
+            return True
+
+        self._pending = None
+        return self._report(progress, step)
+
+    def flush(self):
+        """Report the last update, if it was held back"""
+        if self._pending is not None:
+            self._report(*self._pending)
+            self._pending = None
+
+    def _report(self, progress, step):
+        # Log every 5%, as that's plenty
+        if int(progress) // 5 != self._logged:
+            self._logged = int(progress) // 5
+
+            if step is not None:
+                log.info("%.1f%% (%s)" % (int(progress), step.title()))
+            else:
+                log.info("%.1f%%" % int(progress))
+
+        if self._progress_bar is None:
+            return True
+
+        cmds.progressBar(self._progress_bar,
+                         edit=True,
+                         progress=int(progress * self._max_value / 100))
+
+        # Allow the user to cancel with the ESC key
+        return not cmds.progressBar(self._progress_bar,
+                                    query=True,
+                                    isCancelled=True)
+
+
 @contextlib.contextmanager
-def progressbar(status="Progress.. ", max_value=100):
+def progressbar(status="Progress.. ", max_value=100, interval=None):
+    """Show progress in Maya's main progress bar, if there is one
+
+    Arguments:
+        status (str, optional): Text shown alongside the bar
+        max_value (int, optional): Progress at 100%
+        interval (float, optional): Seconds between updates,
+            defaults to RAGDOLL_PROGRESS_INTERVAL
+
+    """
+
     if _is_interactive():
         import maya.mel
         progress_bar = maya.mel.eval('$tmp = $gMainProgressBar')
@@ -1618,13 +1734,17 @@ def progressbar(status="Progress.. ", max_value=100):
                          maxValue=max_value)
 
         try:
-            yield progress_bar
+            p = _Progress(progress_bar, max_value, interval)
+            yield p
+            p.flush()
 
         finally:
             cmds.progressBar(progress_bar, edit=True, endProgress=True)
 
     else:
-        yield
+        p = _Progress(max_value=max_value, interval=interval)
+        yield p
+        p.flush()
 
 
 @i__.with_undo_chunk
@@ -1727,7 +1847,7 @@ def record_markers(selection=None, **opts):
             mod.try_set_attr(solver["cache"], c.StaticCache)
 
     total_frames = 0
-    timer = i__.Timer("record")
+    timer = i__.Timer("interactive.record_markers")
     for solver in solvers:
         with timer as duration, progressbar() as p:
             instance = recording._Recorder(solver, {
@@ -1744,20 +1864,9 @@ def record_markers(selection=None, **opts):
                 "resetMarkers": opts["recordReset"],
             })
 
-            previous_progress = 0
             for step, progress in instance.record():
-                progress = int(progress)
-
-                if progress % 5 == 0 and progress != previous_progress:
-                    log.info("%.1f%% (%s)" % (progress, step.title()))
-                    previous_progress = progress
-
-                # Allow the user to cancel with the ESC key
-                if _is_interactive():
-                    if cmds.progressBar(p, query=True, isCancelled=True):
-                        break
-
-                    cmds.progressBar(p, edit=True, step=1)
+                if not p.update(progress, step):
+                    break
 
             total_frames += end_frame - start_frame
 
@@ -1803,7 +1912,7 @@ def extract_markers(selection=None, **opts):
     end_time = cmdx.max_time()
 
     total_frames = 0
-    timer = i__.Timer("record")
+    timer = i__.Timer("interactive.extract_markers")
 
     for solver in solvers:
         with timer as duration, progressbar() as p, refresh_suspended():
@@ -1813,21 +1922,9 @@ def extract_markers(selection=None, **opts):
                 "endTime": end_time,
             })
 
-            previous_progress = 0
-            for status in instance.extract():
-                step, progress = status
-                progress = int(progress)
-
-                if progress % 5 == 0 and progress != previous_progress:
-                    log.info("%.1f%% (%s)" % (progress, step.title()))
-                    previous_progress = progress
-
-                # Allow the user to cancel with the ESC key
-                if _is_interactive():
-                    if cmds.progressBar(p, query=True, isCancelled=True):
-                        break
-
-                    cmds.progressBar(p, edit=True, step=1)
+            for step, progress in instance.extract():
+                if not p.update(progress, step):
+                    break
 
             total_frames += int((end_time - start_time).value)
 
@@ -2187,21 +2284,11 @@ def cache_all(selection=None, **opts):
 
     total_frames = 0
     with i__.Timer() as duration, progressbar() as p:
-        it = commands.cache(solvers)
-
-        previous_progress = 0
-        for progress in it:
-            progress = int(progress)
-            if progress % 5 == 0 and progress != previous_progress:
-                log.info("%.1f%%" % progress)
-                previous_progress = progress
-
-            # Allow the user to cancel with the ESC key
-            if cmds.progressBar(p, query=True, isCancelled=True):
+        for progress in commands.cache(solvers):
+            if not p.update(progress):
                 break
 
             total_frames += 1
-            cmds.progressBar(p, edit=True, step=1)
 
     stats = (duration.s, total_frames / max(0.00001, duration.s))
     log.info("Cached %d frames for %d solvers in %.1fs (%d fps)" % (
@@ -2722,7 +2809,7 @@ def _import_physics_wrapper():
     })
 
     try:
-        with i__.Timer("importPhysics") as t:
+        with i__.Timer("interactive.import_physics") as t:
             _singleton_import_loader.reinterpret()
 
     except Exception:
@@ -2745,7 +2832,7 @@ def _import_physics_wrapper():
 
 def _export_physics_wrapper(thumbnail=None):
     try:
-        with i__.Timer("exportPhysics") as t:
+        with i__.Timer("interactive.export_physics") as t:
             data = _singleton_export_loader.dump()
 
             if not data["entities"]:
@@ -2,11 +2,16 @@
 
 import re
 import os
+import sys
 import json
 import time
 import random
+import inspect
+import hashlib
+import marshal
 import logging
 import functools
+import importlib
 import tempfile
 
 from maya import cmds
@@ -370,17 +375,120 @@ def with_contract(args=None, kwargs=None, returns=None, opts=None):
     return with_contract_decorator
 
 
+# Performance counters per operation, see count() and counters()
+_counters = {}
+
+# Durations kept per counter, for its 95th percentile
+_counter_samples = 200
+
+
+def _counter(name):
+    try:
+        return _counters[name]
+    except KeyError:
+        counter = {"count": 0, "total": 0.0, "frames": 0, "samples": []}
+        _counters[name] = counter
+        return counter
+
+
+def count(name, duration):
+    """Add one call of `name` taking `duration` seconds to its counter"""
+    counter = _counter(name)
+    counter["count"] += 1
+    counter["total"] += duration
+
+    # Keep a uniform sample of every duration, within a fixed size
+    samples = counter["samples"]
+    if len(samples) < _counter_samples:
+        samples.append(duration)
+    else:
+        index = random.randrange(counter["count"])
+        if index < _counter_samples:
+            samples[index] = duration
+
+
+def count_frames(name, frames):
+    """Add `frames` simulated by `name` to its counter"""
+    _counter(name)["frames"] += frames
+
+
+def counters():
+    """Return a summary of every counter, durations in seconds
+
+    Example:
+        >>> reset_counters()
+        >>> count("interactive.record_markers", 0.5)
+        >>> count_frames("interactive.record_markers", 100)
+        >>> counters()["interactive.record_markers"]["p95"]
+        0.5
+
+    """
+
+    summary = {}
+    for name, counter in _counters.items():
+        samples = sorted(counter["samples"])
+        summary[name] = {
+            "count": counter["count"],
+            "total": counter["total"],
+            "p95": samples[int(0.95 * (len(samples) - 1))] if samples else 0,
+            "frames": counter["frames"],
+        }
+
+    return summary
+
+
+def reset_counters():
+    _counters.clear()
+
+
+def _timed_generator(name, generator):
+    """Time `generator` between yields, excluding time spent by the caller"""
+    duration = 0.0
+
+    try:
+        while True:
+            t0 = time.time()
+
+            try:
+                value = next(generator)
+            except StopIteration:
+                break
+            finally:
+                duration += time.time() - t0
+
+            yield value
+
+    finally:
+        generator.close()
+        log.debug("%s in %.2fms" % (name, duration * 1000))
+        count(name, duration)
+
+
 def with_timing(func):
+    # E.g. recording._sim_to_cache, unique across modules
+    name = "%s.%s" % (func.__module__.split(".", 1)[-1], func.__name__)
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         t0 = time.time()
+        generator = False
 
         try:
-            return func(*args, **kwargs)
+            result = func(*args, **kwargs)
+            generator = inspect.isgenerator(result)
+
+            if generator:
+                # The work happens as it is iterated
+                result = _timed_generator(name, result)
+
+            return result
+
         finally:
-            t1 = time.time()
-            duration = t1 - t0
-            log.debug("%s in %.2fms" % (func.__name__, duration * 1000))
+            if not generator:
+                t1 = time.time()
+                duration = t1 - t0
+                log.debug("%s in %.2fms" % (name, duration * 1000))
+                count(name, duration)
 
     return wrapper
 
@@ -412,6 +520,9 @@ class Timer(object):
         self._t1 = time.time()
         self._duration += self._t1 - self._t0
 
+        if self._name:
+            count(self._name, self._t1 - self._t0)
+
     def __enter__(self):
         self.start()
         return self
@@ -423,6 +534,72 @@ class Timer(object):
             log.debug("%s in %.2fms" % (self._name, self.ms))
 
 
+class Throttle(object):
+    """Let through at most one update every `interval` seconds
+
+    Example:
+        >>> throttle = Throttle(interval=60)
+        >>> throttle.ready()
+        True
+        >>> throttle.ready()
+        False
+        >>> throttle.ready(force=True)
+        True
+
+    """
+
+    def __init__(self, interval=None):
+        if interval is None:
+            interval = constants.RAGDOLL_PROGRESS_INTERVAL
+
+        self._interval = interval
+        self._last = None
+
+    def ready(self, force=False):
+        now = time.time()
+
+        if force or self._last is None or now - self._last >= self._interval:
+            self._last = now
+            return True
+
+        return False
+
+
+def throttle(iterable, interval=None, key=None):
+    """Yield from `iterable` at most once every `interval` seconds
+
+    Items in between are skipped, except for the last one which is
+    always yielded, and any for which `key` returns something other
+    than for the item before, such as the next step of a recording.
+
+    Example:
+        >>> items = [("a", 1), ("a", 2), ("b", 3), ("b", 4), ("b", 5)]
+        >>> list(throttle(items, interval=60, key=lambda item: item[0]))
+        [('a', 1), ('b', 3), ('b', 5)]
+
+    """
+
+    limiter = Throttle(interval)
+    pending = skipped = previous = object()
+
+    for item in iterable:
+        force = False
+
+        if key is not None:
+            current = key(item)
+            force = current != previous
+            previous = current
+
+        if limiter.ready(force=force):
+            pending = skipped
+            yield item
+        else:
+            pending = item
+
+    if pending is not skipped:
+        yield pending
+
+
 def with_refresh_suspended(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
@@ -451,6 +628,139 @@ def with_undo_chunk(func):
     return _undo_chunk
 
 
+class _LazyModule(object):
+    """Stand-in for a module, imported on first attribute access"""
+
+    def __init__(self, name, package):
+        self.__dict__["_name"] = name
+        self.__dict__["_package"] = package
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        if self._module is None:
+            module = importlib.import_module(self._name, self._package)
+            self.__dict__["_module"] = module
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        return "<lazy module '%s'>" % self._name
+
+
+def lazy_import(name):
+    """Import `name` relative to this package on first use
+
+    Example:
+        >>> ui = lazy_import(".ui")
+        >>> ui  # Not yet imported
+        <lazy module '.ui'>
+
+    """
+
+    return _LazyModule(name, __name__.rsplit(".", 1)[0])
+
+
+def write_atomic(fname, data):
+    """Write `data` bytes to `fname`, such that no one reads only part
+
+    The bytes go to a temporary file next to `fname` first, which then
+    replaces `fname` in one go.
+
+    """
+
+    fd, temp = tempfile.mkstemp(dir=os.path.dirname(fname), suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+
+        try:
+            os.replace(temp, fname)
+
+        except AttributeError:
+            # Python 2, where rename won't replace on Windows
+            if os.path.exists(fname):
+                os.remove(fname)
+
+            os.rename(temp, fname)
+
+    except Exception:
+        os.remove(temp)
+        raise
+
+
+def _json_cache(fname):
+    key = hashlib.sha1(os.path.abspath(fname).encode("utf-8")).hexdigest()
+    return os.path.join(
+        os.path.expanduser("~/.ragdoll"), "cache", "%s-py%d%d.marshal" % (
+            key[:12], sys.version_info[0], sys.version_info[1]
+        )
+    )
+
+
+def _is_private(stat):
+    """Is what `stat` describes owned and only writable by this user?"""
+    try:
+        uid = os.getuid()
+    except AttributeError:
+        # Windows, where the home directory is private already
+        return True
+
+    return stat.st_uid == uid and not stat.st_mode & 0o022
+
+
+def read_json(fname):
+    """Parse `fname`, re-using the previous parse until it changes
+
+    The parsed result is marshalled to ~/.ragdoll/cache, keyed by
+    the modification time and size of `fname`. Marshal loads roughly
+    an order of magnitude faster than JSON parses, but is unsafe on
+    untrusted input. Caches anyone but this user could have written
+    are ignored.
+
+    """
+
+    stat = os.stat(fname)
+    key = (stat.st_mtime, stat.st_size)
+    cache = _json_cache(fname)
+
+    try:
+        # Read in one go, marshal.load() reads a file in small chunks
+        with open(cache, "rb") as f:
+            if not (_is_private(os.stat(os.path.dirname(cache))) and
+                    _is_private(os.fstat(f.fileno()))):
+                raise ValueError("%s is not private" % cache)
+
+            cached_key, data = marshal.loads(f.read())
+
+        if tuple(cached_key) == key:
+            return data
+
+    except Exception:
+        # Missing, stale, corrupt, not private or from another version
+        pass
+
+    with open(fname) as f:
+        data = json.load(f)
+
+    try:
+        if not os.path.isdir(os.path.dirname(cache)):
+            os.makedirs(os.path.dirname(cache), 0o700)
+
+        write_atomic(cache, marshal.dumps((key, data)))
+
+    except (IOError, OSError, ValueError):
+        # Not the end of the world, we'll parse it again next time
+        log.debug("Could not cache %s" % fname)
+
+    return data
+
+
 def sort_filenames(fnames, suffix=".rag"):
     """Sort by numbered suffix
 
@@ -621,30 +931,57 @@ def write_scheduling_graph():
     return svg
 
 
-def sort_by_evaluation_order(nodes, minimal=False):
-    """Return `nodes` sorted by the order in which they are evaluated
+# Execution order of the evaluation graph, see sort_by_evaluation_order
+_evaluation_order = {
+    "revision": 0,  # Incremented whenever the graph may have changed
+    "indexed": None,  # Revision and evaluation mode of the current index
+    "index": {},  # Name -> depth in the graph
+    "callbacks": [],
+}
+
+
+def _on_graph_changed(*args):
+    _evaluation_order["revision"] += 1
+
+
+def install_graph_callbacks():
+    """Keep track of changes to the graph, for sort_by_evaluation_order"""
+    if _evaluation_order["callbacks"]:
+        return
+
+    om = cmdx.om
+    _evaluation_order["callbacks"] += [
+        om.MDGMessage.addNodeAddedCallback(_on_graph_changed),
+        om.MDGMessage.addNodeRemovedCallback(_on_graph_changed),
+        om.MDGMessage.addConnectionCallback(_on_graph_changed),
+        om.MDagMessage.addAllDagChangesCallback(_on_graph_changed),
+        om.MNodeMessage.addNameChangedCallback(
+            om.MObject.kNullObj, _on_graph_changed),
+        om.MSceneMessage.addCallback(
+            om.MSceneMessage.kAfterNew, _on_graph_changed),
+        om.MSceneMessage.addCallback(
+            om.MSceneMessage.kAfterOpen, _on_graph_changed),
+    ]
 
-    Reach into Maya's evaluation graph for hints about the execution
-    order, accessible via cmds.dbpeek. This won't work for DG evaluation
-    however..
 
-    Arguments:
-        node (list): Of any kind of DG or DagNode
-        minimal (bool, optional): Only look at `nodes`, default False
+def uninstall_graph_callbacks():
+    for callback_id in _evaluation_order["callbacks"]:
+        cmdx.om.MMessage.removeCallback(callback_id)
+
+    _evaluation_order["callbacks"][:] = []
+    _evaluation_order["indexed"] = None
+    _evaluation_order["index"] = {}
 
-    """
 
+def _peek_evaluation_order(names):
+    """Return {name: depth} of every node in the evaluation graph"""
     peek_args = {
         "op": "graph",
         "evaluationGraph": True,
         "argument": ["scheduling", "verbose"]
     }
 
-    data = cmds.dbpeek(
-        [node.shortest_path() for node in nodes]
-        if minimal else [],
-        **peek_args
-    )
+    data = cmds.dbpeek(names, **peek_args)
 
     if data.startswith("\nERROR"):
         # This only works in Parallel/Serial modes
@@ -652,37 +989,134 @@ def sort_by_evaluation_order(nodes, minimal=False):
 
     scheduling = json.loads(data)["scheduling"]
 
-    keys = {node.shortest_path().encode("ascii"): node for node in nodes}
-    nodes = {key: 0 for key in keys.keys()}
+    # The execution order is a depth-first dictionary
+    # of the order in which nodes execute.
+    index = {}
+    stack = [(scheduling["executionOrder"], 1)]
+
+    while stack:
+        children, depth = stack.pop()
+
+        for key, value in children.items():
+            # Include evaluators, e.g. CycleLayer[2,_:R_leftFoot_ctl]
+            # and e.g. pruneRoots|CustomEvaluatorLayer[2,_:L_hand_ctl]
+            key = key.rsplit(",", 1)[-1].rstrip("]")
+            index[key] = index.get(key, 0) + depth
+
+            if value:
+                stack.append((value, depth + 1))
+
+    return index
 
-    def walk(key, value, depth=0):
-        # Include evaluators, e.g. CycleLayer[2,_:R_leftFoot_ctl]
-        # and e.g. pruneRoots|CustomEvaluatorLayer[2,_:L_hand_ctl]
-        key = key.rsplit(",", 1)[-1].rstrip("]")
 
-        if key in nodes:
-            nodes[key] += depth
+def sort_by_evaluation_order(nodes, minimal=False):
+    """Return `nodes` sorted by the order in which they are evaluated
 
-        for key, value in value.items():
-            walk(key, value, depth + 1)
+    Reach into Maya's evaluation graph for hints about the execution
+    order, accessible via cmds.dbpeek. This won't work for DG evaluation
+    however..
+
+    The order of the whole graph is remembered until the graph
+    or evaluation mode changes, see install_graph_callbacks.
+
+    Arguments:
+        node (list): Of any kind of DG or DagNode
+        minimal (bool, optional): Only look at `nodes`, default False
+
+    """
+
+    keys = {node.shortest_path(): node for node in nodes}
 
     with Timer() as t:
-        # The execution order is a depth-first dictionary
-        # of the order in which nodes execute.
-        walk("", scheduling["executionOrder"])
+        if minimal:
+            index = _peek_evaluation_order(list(keys))
+
+        else:
+            install_graph_callbacks()
+
+            # Changing mode rebuilds the graph, without a callback
+            mode = cmds.evaluationManager(query=True, mode=True)[0]
+            revision = (_evaluation_order["revision"], mode)
+
+            if _evaluation_order["indexed"] != revision:
+                _evaluation_order["index"] = _peek_evaluation_order([])
+                _evaluation_order["indexed"] = revision
+
+            index = _evaluation_order["index"]
 
     log.debug("sort_by_evaluation_order: %.2fms" % t.ms)
 
     # Turn back into objects
-    items = sorted(nodes.items(), key=lambda item: item[1])
-    return list(keys[item[0]] for item in items)
+    items = sorted(keys.items(), key=lambda item: index.get(item[0], 0))
+    return list(item[1] for item in items)
 
 
 def sort_by_hierarchy(dagnodes):
     pass
 
 
-def sort_by_parent(markers):
+class Topology(object):
+    """Parent and children of each marker, queried once
+
+     o
+     |
+     o--o--o
+     |
+     o
+
+    Arguments:
+        markers (list): Markers to relate, parents outside of
+            this list are considered roots
+
+    """
+
+    def __init__(self, markers):
+        self._markers = list(markers)
+        self._parents = {}
+        self._children = {marker: [] for marker in self._markers}
+
+        with Timer() as t:
+            for marker in self._markers:
+                parent = marker["parentMarker"].input(type="rdMarker")
+
+                if parent not in self._children:
+                    parent = None
+
+                self._parents[marker] = parent
+
+                if parent is not None:
+                    self._children[parent].append(marker)
+
+        log.debug("Topology of %d markers: %.2fms" % (
+            len(self._markers), t.ms))
+
+    def __contains__(self, marker):
+        return marker in self._parents
+
+    def __iter__(self):
+        return iter(self._markers)
+
+    def __len__(self):
+        return len(self._markers)
+
+    @property
+    def markers(self):
+        return list(self._markers)
+
+    def parent(self, marker):
+        return self._parents.get(marker)
+
+    def children(self, marker):
+        return list(self._children.get(marker, []))
+
+    def roots(self):
+        return [
+            marker for marker in self._markers
+            if self._parents[marker] is None
+        ]
+
+
+def sort_by_parent(markers, topology=None):
     """Figure out kinematic hierarchy of `markers`
 
     Look to the parent marker for a hint about its evaluation order.
@@ -695,6 +1129,12 @@ def sort_by_parent(markers):
     to be parented to an IK control in which case the order will
     not be correct.
 
+    Arguments:
+        markers (list): Markers to sort
+        topology (Topology, optional): Reuse parents of markers in
+            this topology, rather than query them again. Parents
+            outside of it count as roots, as they do for Topology
+
     """
 
     assert isinstance(markers, (list, tuple)), (
@@ -703,16 +1143,40 @@ def sort_by_parent(markers):
 
     orders = {marker: 0 for marker in markers}
 
+    # Depth of every marker seen, including parents outside of `markers`
+    depths = {}
+
+    def parent_of(marker):
+        if topology is not None and marker in topology:
+            return topology.parent(marker)
+
+        return marker["parentMarker"].input(type="rdMarker")
+
     with Timer() as t:
-        for marker, order in orders.items():
-            parent = marker["parentMarker"].input(type="rdMarker")
+        for marker in orders:
+            if marker in depths:
+                continue
+
+            # Walk up to the first marker of known depth, and
+            # remember the depth of everything on the way down.
+            chain = []
+            visited = set()
+            parent = marker
+
+            while parent is not None and parent not in depths:
+                if parent in visited:
+                    raise CycleError("%s is its own parent" % parent)
+
+                chain.append(parent)
+                visited.add(parent)
+                parent = parent_of(parent)
 
-            while parent:
-                order += 1
-                parent = parent["parentMarker"].input()
+            depth = -1 if parent is None else depths[parent]
 
-            orders[marker] = order
+            for parent in reversed(chain):
+                depth += 1
+                depths[parent] = depth
 
     log.debug("sort_by_parent: %.2fms" % t.ms)
 
-    return list(sorted(orders.keys(), key=lambda key: orders[key]))
+    return list(sorted(orders.keys(), key=lambda key: depths[key]))
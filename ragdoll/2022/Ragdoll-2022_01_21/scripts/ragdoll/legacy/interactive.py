@@ -1306,7 +1306,7 @@ def bake_simulation(selection=None, **opts):
     if not rigids:
         return log.warning("No rigids found!")
 
-    with i__.Timer("bake") as duration:
+    with i__.Timer("legacy.interactive.bake_simulation") as duration:
         if _opt("bakePerformance", opts) == 1:
             with isolate_select(rigids):
                 commands.bake_simulation(rigids, opts=opts_)
@@ -9,13 +9,22 @@ convenient method of Python to C++ communication.
 
 import os
 import copy
+import json
 import logging
 from maya import cmds
 from . import internal as i__, __
-from .vendor import qargparse
 
 log = logging.getLogger("ragdoll")
 
+# Values read from Maya, by optionvar key, see read()
+_cache = {}
+
+# Calls to cmds.optionVar saved by the cache, see stats()
+_stats = {"hits": 0, "misses": 0}
+
+# Cached for optionvars that do not exist
+_missing = object()
+
 
 def _resource(*fname):
     dirname = os.path.dirname(__file__)
@@ -32,29 +41,16 @@ def write(arg, value=None):
     if isinstance(arg, i__.string_types):
         arg = __.optionvars[arg]
 
-    if isinstance(arg, qargparse.QArgument):
+    # E.g. qargparse.QArgument, without importing Qt
+    if not isinstance(arg, dict):
         arg = __.optionvars[arg["name"]]
 
     key = _optionvarkey(arg["name"])
 
-    if value is None:
-        value = arg["default"]
-
-    if arg["type"] == "Enum":
-        value = value or 0
-        assert isinstance(value, int), "%s was not an enum" % value
+    # Read back from Maya, which knows best how it got stored
+    _cache.pop(key, None)
 
-    if arg["type"] == "Boolean":
-        value = bool(value)
-        assert isinstance(value, bool), (
-            "%s was not a bool" % value
-        )
-
-    if arg["type"] == "String":
-        value = value or ""
-        assert isinstance(value, i__.string_types), (
-            "%s was not a string" % value
-        )
+    value = _coerce(arg, value)
 
     if isinstance(value, float):
         cmds.optionVar(floatValue=(key, value))
@@ -106,11 +102,207 @@ def write(arg, value=None):
         )
 
 
+def _coerce(arg, value):
+    if value is None:
+        value = arg["default"]
+
+    if arg["type"] == "Enum":
+        value = value or 0
+        assert isinstance(value, int), "%s was not an enum" % value
+
+    if arg["type"] == "Boolean":
+        value = bool(value)
+        assert isinstance(value, bool), (
+            "%s was not a bool" % value
+        )
+
+    if arg["type"] == "String":
+        value = value or ""
+        assert isinstance(value, i__.string_types), (
+            "%s was not a string" % value
+        )
+
+    return value
+
+
+def _stored(value):
+    """Return `value` the way cmds.optionVar(query=True) returns it"""
+    if isinstance(value, bool):
+        return int(value)
+
+    if isinstance(value, (tuple, list)):
+        return [_stored(v) for v in value]
+
+    return value
+
+
+def _same(current, value):
+    """Is `value` already stored as `current`, including its type?"""
+    if isinstance(current, i__.string_types):
+        # Either str or unicode under Python 2
+        return current == value
+
+    if isinstance(current, list):
+        return isinstance(value, list) and len(current) == len(value) and (
+            all(_same(a, b) for a, b in zip(current, value))
+        )
+
+    return current == value and type(current) is type(value)
+
+
+def write_many(values):
+    """Write many optionvars at once, skipping those already stored
+
+    Arguments:
+        values (dict): Value per optionvar name, e.g. "scale",
+            where None means its default.
+
+    Returns:
+        int: Number of optionvars written
+
+    """
+
+    stored = {}
+    for name, value in values.items():
+        arg = __.optionvars[name]
+        stored[_optionvarkey(name)] = _stored(_coerce(arg, value))
+
+    return _write_stored(stored)
+
+
+def _write_stored(values):
+    """Write `values` by optionvar key, in one call per type of value
+
+    Values are compared with those currently stored, and only
+    those that differ are written.
+
+    """
+
+    existing = set(cmds.optionVar(list=True))
+    calls = {}
+    arrays = []
+
+    for key, value in sorted(values.items()):
+        current = _cache.get(key, _missing)
+
+        if current is _missing and key in existing:
+            current = cmds.optionVar(query=key)
+            _cache[key] = current
+
+        if current is not _missing and _same(current, value):
+            continue
+
+        # Read back from Maya, which knows best how it got stored
+        _cache.pop(key, None)
+
+        if isinstance(value, list):
+            if not value and key not in existing:
+                continue
+
+            # Otherwise appended to what is already there, and
+            # an empty array is stored as no array at all
+            arrays.append(key)
+
+            if not value:
+                continue
+
+            flag = {float: "floatValueAppend",
+                    int: "intValueAppend"}.get(type(value[0]),
+                                               "stringValueAppend")
+            calls.setdefault(flag, []).extend(
+                (key, v if v is not None else "") for v in value
+            )
+
+        elif isinstance(value, float):
+            calls.setdefault("floatValue", []).append((key, value))
+
+        elif isinstance(value, int):
+            calls.setdefault("intValue", []).append((key, value))
+
+        elif isinstance(value, i__.string_types):
+            calls.setdefault("stringValue", []).append((key, value))
+
+        else:
+            raise TypeError(
+                "Unrecognised default type for optionvar %s: %s"
+                % (key, value)
+            )
+
+    existing_arrays = [key for key in arrays if key in existing]
+    if existing_arrays:
+        cmds.optionVar(remove=existing_arrays)
+
+    # Every flag is multi-use, one call writes every value of its type
+    for flag in ("floatValue",
+                 "intValue",
+                 "stringValue",
+                 "floatValueAppend",
+                 "intValueAppend",
+                 "stringValueAppend"):
+        if flag in calls:
+            cmds.optionVar(**{flag: calls[flag]})
+
+    return sum(
+        len(pairs) for flag, pairs in calls.items()
+        if not flag.endswith("Append")
+    ) + len(arrays)
+
+
+def snapshot():
+    """Return every stored Ragdoll optionvar as one string
+
+    Example:
+        >>> write("scale", 1.0)
+        >>> blob = snapshot()
+        >>> write("scale", 2.0)
+        >>> restore(blob)
+        1
+        >>> read("scale")
+        1.0
+
+    """
+
+    values = {}
+    for key in cmds.optionVar(list=True):
+        if key.startswith("ragdoll"):
+            values[key] = _cache.get(key, _missing)
+
+            if values[key] is _missing:
+                values[key] = cmds.optionVar(query=key)
+
+    return json.dumps(values, sort_keys=True)
+
+
+def restore(blob):
+    """Restore optionvars to a previous snapshot()
+
+    Optionvars stored since the snapshot are removed.
+
+    Returns:
+        int: Number of optionvars written or removed
+
+    """
+
+    values = json.loads(blob)
+    added = [
+        key for key in cmds.optionVar(list=True)
+        if key.startswith("ragdoll") and key not in values
+    ]
+
+    if added:
+        cmds.optionVar(remove=added)
+
+    for key in added:
+        _cache.pop(key, None)
+
+    return _write_stored(values) + len(added)
+
+
 def read(arg):
     if isinstance(arg, i__.string_types):
         arg = __.optionvars.get(arg)
 
-    if isinstance(arg, qargparse.QArgument):
+    if arg is not None and not isinstance(arg, dict):
         arg = __.optionvars.get(arg["name"])
 
     if arg is None:
@@ -119,12 +311,34 @@ def read(arg):
     name = arg["name"]
     key = _optionvarkey(name)
 
-    if not cmds.optionVar(exists=key):
+    try:
+        value = _cache[key]
+
+    except KeyError:
+        _stats["misses"] += 1
+
+        if cmds.optionVar(exists=key):
+            value = cmds.optionVar(query=key)
+        else:
+            value = _missing
+
+        _cache[key] = value
+
+    else:
+        _stats["hits"] += 1
+
+    if value is _missing:
+        # Never stored, e.g. install(seed=False)
+        value = arg.get("default")
+
+    if value is None:
         return None
 
-    value = cmds.optionVar(query=key)
+    if isinstance(value, list):
+        # Leave the cached value alone
+        value = list(value)
 
-    if arg["type"] == qargparse.Boolean:
+    if arg["type"] == "Boolean":
         # Stored as an integer
         return bool(value)
 
@@ -132,29 +346,56 @@ def read(arg):
         return value
 
 
-def install(reset=False):
+def install(reset=False, seed=True):
     """Ensure default optionvars exists
 
     Arguments:
         reset (bool): Whether or not to preserve those stored
             in the Maya preferences
+        seed (bool): Whether or not to store defaults for those
+            not yet stored, read() falls back to them either way
 
     """
 
-    for arg in __.optionvars.values():
-        var = _optionvarkey(arg["name"])
-        if cmds.optionVar(exists=var) and not reset:
-            continue
+    values = {}
+
+    if seed:
+        existing = set(cmds.optionVar(list=True))
 
-        write(arg)
+        for arg in __.optionvars.values():
+            if reset or _optionvarkey(arg["name"]) not in existing:
+                values[arg["name"]] = None
 
-    write("shaderPath", _resource("shaders"))
-    write("fontPath", _resource("fonts"))
-    write("iconPath", _resource("icons"))
+    values["shaderPath"] = _resource("shaders")
+    values["fontPath"] = _resource("fonts")
+    values["iconPath"] = _resource("icons")
+
+    write_many(values)
 
 
 def uninstall():
-    pass
+    log.debug("options.read: %(hits)d of %(calls)d calls cached" % stats())
+    clear()
+
+
+def clear():
+    """Forget values read, for when optionvars are edited elsewhere"""
+    _cache.clear()
+
+
+def stats():
+    """Return how many calls to read() were answered from the cache
+
+    Each cached call saves the 1-2 calls to cmds.optionVar
+    it would otherwise have made.
+
+    """
+
+    return {
+        "hits": _stats["hits"],
+        "misses": _stats["misses"],
+        "calls": _stats["hits"] + _stats["misses"],
+    }
 
 
 def save():
@@ -165,18 +406,19 @@ def save():
 def reset():
     """Remove all persistent optionvars"""
 
-    total = 0
     changed = 0
-    previous = {}
+    previous = json.loads(snapshot())
+    total = len(previous)
     old = copy.deepcopy(__.optionvars)
 
-    for var in cmds.optionVar(list=True):
-        if var.startswith("ragdoll"):
-            previous[var] = cmds.optionVar(query=var)
-            cmds.optionVar(remove=var)
-            total += 1
+    # Only Ragdoll's own optionvars are kept
+    known = set(_optionvarkey(name) for name in __.optionvars)
+    unknown = [var for var in previous if var not in known]
+    if unknown:
+        cmds.optionVar(remove=unknown)
 
-    install()
+    clear()
+    install(reset=True)
 
     for arg in __.optionvars.values():
 
@@ -25,7 +25,9 @@ def record(solver, opts=None):
     """
 
     recorder = _Recorder(solver, opts)
-    for message, progress in recorder.record():
+    steps = internal.throttle(recorder.record(), key=lambda step: step[0])
+
+    for message, progress in steps:
         log.info(message)
 
 
@@ -127,6 +129,7 @@ class _Recorder(object):
 
         # Pre-processing, only relevant once
         markers = _find_markers(solver)
+        topology = internal.Topology(markers)
         dst_to_marker, dst_to_offset = _find_destinations(markers, {
             "include": opts["include"] or [],
             "exclude": opts["exclude"] or [],
@@ -144,6 +147,7 @@ class _Recorder(object):
 
         self._solver = solver
         self._markers = markers
+        self._topology = topology
 
         self._opts = opts
 
@@ -174,7 +178,8 @@ class _Recorder(object):
         for progress in self._sim_to_cache():
             yield ("simulating", progress * 0.49)
 
-        marker_to_dagnode = _generate_kinematic_hierarchy(self._solver)
+        marker_to_dagnode = _generate_kinematic_hierarchy(
+            self._solver, topology=self._topology)
 
         for progress in self._cache_to_curves(marker_to_dagnode):
             yield ("transferring", 49 + progress * 0.10)
@@ -190,11 +195,6 @@ class _Recorder(object):
         if self._opts["resetMarkers"]:
             self._reset()
 
-        if self._opts["rotationFilter"] == 1:
-            _euler_filter(self._dst_to_marker.keys())
-        elif self._opts["rotationFilter"] == 2:
-            _quat_filter(self._dst_to_marker.keys())
-
         def cleanup():
             # Ahead of deleting the constraints, ensure we're on the
             # solver start frame. Why? Because those are the values we want
@@ -219,9 +219,10 @@ class _Recorder(object):
             yield ("simulating", progress * 0.50)
 
         marker_to_dagnode = _generate_kinematic_hierarchy(
-            self._solver, tips=True)
+            self._solver, tips=True, topology=self._topology)
 
-        for progress in self._cache_to_curves(marker_to_dagnode):
+        for progress in self._cache_to_curves(marker_to_dagnode,
+                                              unroll=True):
             yield ("transferring", 50 + progress * 0.50)
 
         # if self._opts["keepConstraints"]:
@@ -240,7 +241,8 @@ class _Recorder(object):
         start_frame = self._solver_start_frame
         current_frame = int(initial_time.value)
 
-        marker_to_dagnode = _generate_kinematic_hierarchy(self._solver)
+        marker_to_dagnode = _generate_kinematic_hierarchy(
+            self._solver, topology=self._topology)
         sim_to_cache = self._sim_to_cache([current_frame, start_frame])
         cache_to_curves = self._cache_to_curves(marker_to_dagnode,
                                                 [start_frame, current_frame])
@@ -251,17 +253,44 @@ class _Recorder(object):
         for _ in cache_to_curves:
             pass
 
+        # Only the current frame is keyed, unroll it against the one
+        # before it as animated, rather than filter whole curves after
+        rotation_filter = self._opts["rotationFilter"]
+        before = cmdx.time(current_frame - 1)
+        previous = {}
+
+        if rotation_filter:
+            for dst in self._dst_to_marker:
+                order = dst["rotateOrder"].read()
+                previous[dst] = dst["rotate"].as_euler_rotation(
+                    order, time=before)
+
         cons = self._attach(marker_to_dagnode)
+        unit = cmdx.om.MAngle.uiUnit()
 
         # Put a keyframe on everything with keyframes
         for dst in self._dst_to_marker:
+            values = {}
+
+            if dst in previous:
+                order = dst["rotateOrder"].read()
+                rotation = _unroll(dst["rotate"].as_euler_rotation(order),
+                                   previous[dst], rotation_filter)
+
+                for channel, angle in (("rx", rotation.x),
+                                       ("ry", rotation.y),
+                                       ("rz", rotation.z)):
+                    angle = cmdx.om.MAngle(angle).asUnits(unit)
+                    values[channel] = {"value": angle}
+
             for channel in ("tx", "ty", "tz",
                             "rx", "ry", "rz"):
                 if dst[channel].input():
                     # They may be connected but locked, or whatever
                     # else going on there. Either way, it's not important
                     try:
-                        cmds.setKeyframe(dst.path(), attribute=channel)
+                        cmds.setKeyframe(dst.path(), attribute=channel,
+                                         **values.get(channel, {}))
                     except RuntimeError:
                         log.debug(traceback.format_exc())
                         log.warning(
@@ -274,14 +303,9 @@ class _Recorder(object):
 
         cmds.delete(temp)
 
-        if self._opts["rotationFilter"] == 1:
-            _euler_filter(self._dst_to_marker.keys())
-
-        elif self._opts["rotationFilter"] == 2:
-            _quat_filter(self._dst_to_marker.keys())
-
     def _snap_from_retarget(self, _force=False):
-        marker_to_dagnode = _generate_kinematic_hierarchy(self._solver)
+        marker_to_dagnode = _generate_kinematic_hierarchy(
+            self._solver, topology=self._topology)
 
         # Align kinematic hierarchy to worldspace simulation
         marker_to_matrix = {}
@@ -291,7 +315,7 @@ class _Recorder(object):
 
         with cmdx.DagModifier() as mod:
             for marker, dagnode in marker_to_dagnode.items():
-                parent = marker["parentMarker"].input(type="rdMarker")
+                parent = self._topology.parent(marker)
                 matrix = marker_to_matrix[marker]
                 parent_matrix = marker_to_matrix.get(parent, cmdx.Mat4())
                 local_matrix = matrix * parent_matrix.inverse()
@@ -344,6 +368,17 @@ class _Recorder(object):
 
         initial_time = cmdx.current_time()
 
+        # Resolve plugs once, and read them all in one go per frame
+        plugs = []
+        for marker in self._markers:
+            attrs = cmdx.accessor(marker)
+            plugs += [
+                attrs.retr,
+                attrs.rero,
+                attrs.ouma,
+                attrs["_kinematic"],
+            ]
+
         total = self._end_frame - self._solver_start_frame
         for frame in _range:
             if self._opts["experimental"]:
@@ -360,16 +395,19 @@ class _Recorder(object):
                 self._solver["currentState"].read()
 
             # Record results
-            for marker in self._markers:
+            values = cmdx.read_many(plugs)
+            offsets = range(0, len(values), 4)
+
+            for marker, offset in zip(self._markers, offsets):
+                retr, rero, ouma, is_kinematic = values[offset:offset + 4]
+
                 if self._opts["includeKinematic"]:
                     is_kinematic = False
-                else:
-                    is_kinematic = marker["_kinematic"].read()
 
                 self._cache[marker][frame] = {
-                    "recordTranslation": marker["retr"].read(),
-                    "recordRotation": marker["rero"].read(),
-                    "outputMatrix": marker["ouma"].as_matrix(),
+                    "recordTranslation": retr,
+                    "recordRotation": rero,
+                    "outputMatrix": cmdx.Mat4(ouma),
                     "kinematic": is_kinematic,
                     "transition": False,
                 }
@@ -382,6 +420,7 @@ class _Recorder(object):
                     self._cache[marker][frame]["recordTranslation"] = False
                     self._cache[marker][frame]["recordRotation"] = False
 
+            internal.count_frames("recording._sim_to_cache", 1)
             progress = frame - self._solver_start_frame
             percentage = 100.0 * progress / total
             yield percentage
@@ -389,9 +428,14 @@ class _Recorder(object):
         cmdx.current_time(initial_time)
 
     @internal.with_timing
-    def _cache_to_curves(self, marker_to_dagnode, _range=None):
+    def _cache_to_curves(self, marker_to_dagnode, _range=None, unroll=False):
         r"""Convert worldspace matrices into translate/rotate channels
 
+        Rotations are unrolled per the `rotationFilter` option when
+        `unroll` is True, for curves that outlive the recorder. Others
+        only ever serve as targets for constraints, which see through
+        any euler representation.
+
                                  ___ z
         x |______       ____    /
           |   ___\_____/____\__/
@@ -412,11 +456,12 @@ class _Recorder(object):
         # Generate animation
         progress = 0
         for marker, dagnode in marker_to_dagnode.items():
-            parent = marker["parentMarker"].input(type="rdMarker")
+            parent = self._topology.parent(marker)
 
             tx, ty, tz = {}, {}, {}
             rx, ry, rz = {}, {}, {}
             s = cmdx.Vector(1, 1, 1)
+            previous = None
 
             for frame in _range:
                 values = self._cache[marker][frame]
@@ -430,6 +475,12 @@ class _Recorder(object):
                 t = tm.translation()
                 r = tm.rotation()
 
+                # Unroll here, rather than filter curves afterwards
+                if unroll and previous is not None:
+                    r = _unroll(r, previous, self._opts["rotationFilter"])
+
+                previous = r
+
                 tx[frame] = t.x
                 ty[frame] = t.y
                 tz[frame] = t.z
@@ -441,7 +492,7 @@ class _Recorder(object):
                 if frame == self._start_frame:
                     s = tm.scale()
 
-            with cmdx.DagModifier() as mod:
+            with cmdx.DagModifier(debug=False) as mod:
                 mod.set_attr(dagnode["tx"], tx)
                 mod.set_attr(dagnode["ty"], ty)
                 mod.set_attr(dagnode["tz"], tz)
@@ -639,7 +690,11 @@ class _Recorder(object):
             "sparseAnimCurveBake": False,
             "removeBakedAttributeFromLayer": False,
             "removeBakedAnimFromLayer": False,
-            "minimizeRotation": False,
+
+            # Unroll as rotations are baked, rather than filter after.
+            # Destinations are driven by constraints, whose rotations
+            # are only known to Maya, so this covers either filter
+            "minimizeRotation": self._opts["rotationFilter"] in (1, 2),
             "bakeOnOverrideLayer": self._opts["toLayer"]
         }
 
@@ -697,108 +752,116 @@ class _Recorder(object):
                     mod.set_attr(group["inputType"], constants.InputKinematic)
 
 
-@internal.with_undo_chunk
-@internal.with_timing
-def _quat_filter(transforms):
-    """Unroll rotations by converting to quaternions and back to euler"""
-    rotate_channels = []
+def _unroll(rotation, previous, mode):
+    """Return `rotation` closest to `previous`, without flips
 
-    def is_keyed(plug):
-        return plug.input(type="animCurveTA") is not None
+    Arguments:
+        rotation (cmdx.EulerRotation): Rotation of this frame
+        previous (cmdx.EulerRotation): Rotation of the frame before
+        mode (int): 0 for none, 1 for euler and 2 for quaternion, like
+            the `rotationFilter` option
 
-    for transform in transforms:
-        # Can only unroll transform with all axes keyed
-        if not all(is_keyed(transform[ch]) for ch in ("rx", "ry", "rz")):
-            continue
+    """
 
-        rotate_channels += ["%s.rx" % transform]
-        rotate_channels += ["%s.ry" % transform]
-        rotate_channels += ["%s.rz" % transform]
+    if mode == 1:
+        # Any equivalent rotation, including flipped ones
+        return rotation.closestSolution(previous)
 
-    cmds.rotationInterpolation(rotate_channels, c="quaternionSlerp")
-    cmds.rotationInterpolation(rotate_channels, c="none")
+    if mode == 2:
+        # Stay in the hemisphere of the previous frame, such that
+        # slerping from one frame to the next takes the shortest arc
+        quat = rotation.asQuaternion()
+        other = previous.asQuaternion()
+        dot = (quat.x * other.x + quat.y * other.y +
+               quat.z * other.z + quat.w * other.w)
 
+        if dot < 0:
+            quat.negateIt()
 
-@internal.with_undo_chunk
-@internal.with_timing
-def _euler_filter(transforms):
-    """Unroll rotations by applying a euler filter"""
-    rotate_curves = []
+        euler = quat.asEulerRotation().reorderIt(rotation.order)
+        return euler.closestSolution(previous)
 
-    def is_keyed(plug):
-        return plug.input(type="animCurveTA") is not None
+    return rotation
 
-    for transform in transforms:
-        # Can only unroll transform with all axes keyed
-        if not all(is_keyed(transform[ch]) for ch in ("rx", "ry", "rz")):
-            continue
 
-        for channel in ("rx", "ry", "rz"):
-            rotate_curves += [transform[channel].input().name()]
+def _generate_kinematic_hierarchy(solver,
+                                  root=None,
+                                  tips=False,
+                                  topology=None):
+    """Create a joint per enabled marker, parented like the markers
+
+    Arguments:
+        solver (cmdx.Node): Solver whose markers to generate joints for
+        root (cmdx.Node, optional): Only generate from this marker
+        tips (bool, optional): Add a joint to the end of each chain
+        topology (internal.Topology, optional): Reuse relationships
+            of markers, rather than query them again
 
-    cmds.filterCurve(rotate_curves, filter="euler")
+    """
 
+    if topology is None:
+        topology = internal.Topology(_find_markers(solver))
 
-def _generate_kinematic_hierarchy(solver, root=None, tips=False):
-    markers = _find_markers(solver)
+    markers = topology.markers
     marker_to_dagnode = {}
 
-    def find_roots():
-        roots = []
-        for marker in markers:
-            if marker["parentMarker"].input(type="rdMarker"):
-                continue
+    values = cmdx.read_many(
+        [(marker, "enabled") for marker in markers] +
+        [(marker, "_culled") for marker in markers]
+    )
 
-            roots.append(marker)
-        return roots
+    count = len(markers)
+    included = {
+        marker: enabled and not culled
+        for marker, enabled, culled in zip(markers,
+                                           values[:count],
+                                           values[count:])
+    }
 
-    roots = find_roots() if root is None else [root]
+    roots = topology.roots() if root is None else [root]
 
-    # Recursively create childhood
-    def recurse(mod, marker, parent=None):
-        if not (marker["enabled"].read() and not marker["_culled"].read()):
-            return
+    # Parents before children, without recursion
+    stack = list(reversed(roots))
 
-        parent = marker_to_dagnode.get(parent)
-        name = marker.name() + "_jnt"
+    with cmdx.DagModifier() as mod:
+        while stack:
+            marker = stack.pop()
 
-        dagnode = mod.create_node("joint", name=name, parent=parent)
-        marker_to_dagnode[marker] = dagnode
+            if not included.get(marker):
+                continue
 
-        children = marker["ragdollId"].outputs(type="rdMarker", plugs=True)
+            parent = marker_to_dagnode.get(topology.parent(marker))
+            name = marker.name() + "_jnt"
 
-        for plug in children:
-            if plug.name() != "parentMarker":
-                continue
+            dagnode = mod.create_node("joint", name=name, parent=parent)
+            marker_to_dagnode[marker] = dagnode
 
-            child = plug.node()
-            recurse(mod, child, marker)
+            children = topology.children(marker)
+            stack.extend(reversed(children))
 
-    def extend_tips(mod):
-        for marker, dagnode in marker_to_dagnode.items():
-            child = dagnode.child()
+            if tips and not any(included.get(c) for c in children):
+                offset = marker["shapeOffset"].as_vector()
+                name = marker.name() + "_tip"
+                joint = mod.create_node("joint", name=name, parent=dagnode)
+                mod.set_attr(joint["t"], offset * 2)
 
-            if child:
-                continue
+    return marker_to_dagnode
 
-            offset = marker["shapeOffset"].as_vector()
-            name = marker.name() + "_tip"
-            joint = mod.create_node("joint", name=name, parent=dagnode)
-            mod.set_attr(joint["t"], offset * 2)
 
-    with cmdx.DagModifier() as mod:
-        for root in roots:
-            recurse(mod, root)
+def _find_markers(solver, markers=None, topology=None):
+    """Return markers of `solver`, its groups and linked solvers
 
-    if tips:
-        with cmdx.DagModifier() as mod:
-            mod.do_it()
-            extend_tips(mod)
+    Arguments:
+        solver (cmdx.Node): Solver whose markers to find
+        markers (list, optional): Append to this list
+        topology (internal.Topology, optional): Markers found before,
+            returned as-is rather than walking `solver` again
 
-    return marker_to_dagnode
+    """
 
+    if topology is not None:
+        return topology.markers
 
-def _find_markers(solver, markers=None):
     if markers is None:
         markers = []
 
@@ -1,18 +1,32 @@
 import os
 import sys
+import glob
 import json
+import time
 import copy
 import errno
 import logging
 import datetime
 import platform
+import threading
+import traceback
 from maya import cmds
 
-from . import __
+from . import constants as c, internal, __
+
+try:
+    from urllib.request import Request, urlopen
+except ImportError:
+    # Python 2
+    from urllib2 import Request, urlopen
 
 log = logging.getLogger(__name__)
 
 
+def _now():
+    return datetime.datetime.now().strftime("%d-%m-%Y, %H:%M:%S")
+
+
 def _gather_ragdoll():
     data = cmds.ragdollReport(gather=True)
     data = json.loads(data)
@@ -43,9 +57,7 @@ def _gather_system():
             pass
 
     __.telemetry_data["system"].update({
-        "time": datetime.datetime.now().strftime(
-            "%d-%m-%Y, %H:%M:%S"
-        ),
+        "time": _now(),
 
         # E.g. win32
         "os": sys.platform,
@@ -68,19 +80,54 @@ def _gather_system():
 
 
 def install():
-    pass
+    """Gather what remains the same until exit, e.g. the GPU"""
+    _gather_system()
+
+
+def _opted_out():
+    """Is telemetry unwanted, or this session not interactive?"""
+    if c.RAGDOLL_NO_TELEMETRY:
+        return True
+
+    return not hasattr(cmds, "about") or cmds.about(batch=True)
 
 
 def gather():
     _gather_ragdoll()
-    _gather_system()
+
+    if not __.telemetry_data["system"]:
+        # Never installed
+        _gather_system()
+
+    __.telemetry_data["system"]["time"] = _now()
 
     return copy.deepcopy(__.telemetry_data)
 
 
-def save():
-    """Write telemetry to ~/.ragdoll/telemetry_<date>.json"""
+def save(data=None):
+    """Write telemetry to ~/.ragdoll/telemetry_<date>.json
+
+    Includes the performance counters of internal.counters(),
+    which are kept locally and never uploaded.
+
+    """
+
+    data = dict(data or __.telemetry_data)
+    data.setdefault("performance", internal.counters())
+
     date = datetime.datetime.now().strftime("%d-%m-%Y-%H%M%S")
+    fname = _ragdoll_dir("telemetry_%s.json" % date)
+
+    if fname is None:
+        return
+
+    # Maya may exit halfway through, leaving nothing rather than half
+    internal.write_atomic(fname, json.dumps(data).encode("utf-8"))
+
+    log.debug("Successfully wrote telemetry to %s" % fname)
+
+
+def _ragdoll_dir(fname):
     dirname = os.path.expanduser("~/.ragdoll")
 
     try:
@@ -94,34 +141,176 @@ def save():
             # Uh oh, probably a problem with permissions
             return log.debug("Wasn't able to create ~/.ragdoll directory")
 
-    fname = os.path.join(dirname, "telemetry_%s.json" % date)
+    return os.path.join(dirname, fname)
 
-    with open(fname, "w") as f:
-        json.dump(__.telemetry_data, f)
 
-    log.debug("Successfully wrote telemetry to %s" % fname)
+def _deferred(session="*"):
+    """Deferred telemetry of `session`, or a pattern matching every one"""
+    return _ragdoll_dir("telemetry_deferred_%s.json" % session)
+
+
+def defer(data=None):
+    """Upload telemetry on a later exit, see upload_deferred()
+
+    Each session defers to a file of its own, such that none is
+    lost to another session exiting before it was uploaded.
+
+    """
+
+    session = "%s-%d" % (
+        datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f"), os.getpid()
+    )
+
+    fname = _deferred(session)
+
+    if fname is not None:
+        dump = json.dumps(data or __.telemetry_data)
+        internal.write_atomic(fname, dump.encode("utf-8"))
+
+
+def upload_deferred(url=None, timeout=None, deadline=None):
+    """Upload what earlier sessions deferred, oldest first
+
+    Arguments:
+        url (str, optional): Passed on to upload()
+        timeout (float, optional): Passed on to upload()
+        deadline (float, optional): Upload nothing more after this
+            time.time(), leaving the rest for next time
+
+    """
+
+    pattern = _deferred()
+
+    if pattern is None or _opted_out():
+        return
 
+    for fname in sorted(glob.glob(pattern)):
+        if deadline is not None and time.time() > deadline:
+            break
+
+        try:
+            with open(fname) as f:
+                data = json.load(f)
+
+            # Whoever removes it first gets to upload it
+            os.remove(fname)
+
+        except (IOError, OSError, ValueError):
+            log.debug("Could not read %s" % fname)
+            continue
+
+        try:
+            upload(data, url, timeout)
+        except Exception:
+            log.debug(traceback.format_exc())
+
+
+def upload(data=None, url=None, timeout=None):
+    """Send anonymous telemetry to Ragdoll's server
+
+    Arguments:
+        data (dict, optional): Defaults to the current telemetry
+        url (str, optional): Post to this address rather than
+            via the plug-in, defaults to RAGDOLL_TELEMETRY_URL
+        timeout (float, optional): Seconds to wait for `url`
+
+    """
+
+    dump = json.dumps(data or __.telemetry_data)
+    url = url or c.RAGDOLL_TELEMETRY_URL
+
+    if url:
+        request = Request(url, data=dump.encode("utf-8"), headers={
+            "Content-Type": "application/json"
+        })
+
+        timeout = timeout or c.RAGDOLL_TELEMETRY_TIMEOUT
+        urlopen(request, timeout=timeout).close()
+
+    else:
+        cmds.ragdollReport(init=True)
+        cmds.ragdollReport(json=dump)
+        cmds.ragdollReport(destroy=True)
+
+
+def send(url=None, timeout=None):
+    """Save and upload telemetry from a background thread
+
+    Waits at most `timeout` seconds for the thread to finish, after
+    which it is left to finish or die along with Maya. Telemetry
+    deferred by earlier sessions is uploaded too, time permitting.
+
+    Uploading via the plug-in calls into Maya, which is only safe
+    from the main thread, and cannot be interrupted. Without a `url`
+    it is only started within `timeout`, and otherwise deferred to
+    the next exit.
+
+    Arguments:
+        url (str, optional): Defaults to RAGDOLL_TELEMETRY_URL
+        timeout (float, optional): Defaults to RAGDOLL_TELEMETRY_TIMEOUT
+
+    Returns:
+        threading.Thread: Possibly still running
+
+    """
+
+    data = copy.deepcopy(__.telemetry_data)
+    url = url or c.RAGDOLL_TELEMETRY_URL
+    timeout = timeout or c.RAGDOLL_TELEMETRY_TIMEOUT
+    deadline = time.time() + timeout
+
+    # Summarised on the main thread, the one adding to them
+    performance = internal.counters()
+
+    def run():
+        try:
+            save(dict(data, performance=performance))
+
+            if url:
+                try:
+                    upload(data, url, timeout)
+                except Exception:
+                    # Try again on next exit
+                    defer(data)
+                    raise
+
+                upload_deferred(url, timeout, deadline)
+
+        except Exception:
+            log.debug(traceback.format_exc())
+
+    thread = threading.Thread(target=run, name="ragdollTelemetry")
+    thread.daemon = True
+    thread.start()
+    thread.join(timeout)
+
+    if thread.is_alive():
+        log.debug("Telemetry still busy after %.1fs, moving on" % timeout)
+
+    if not url:
+        if thread.is_alive() or time.time() > deadline:
+            defer(data)
+
+        else:
+            try:
+                upload(data)
+                upload_deferred(deadline=deadline)
+            except Exception:
+                log.debug(traceback.format_exc())
 
-def upload():
-    """Send anonymous telemetry to Ragdoll's server"""
-    dump = json.dumps(__.telemetry_data)
-    cmds.ragdollReport(init=True)
-    cmds.ragdollReport(json=dump)
-    cmds.ragdollReport(destroy=True)
+    return thread
 
 
 def on_exit():
     """Called on Maya exit"""
 
-    # Only capture interactive sessions
-    if not hasattr(cmds, "about") or cmds.about(batch=True):
+    # Only capture interactive sessions, of those who want it
+    if _opted_out():
         return
 
     try:
         gather()
-        save()
-        upload()
+        send()
 
     except Exception:
-        import traceback
         sys.stderr.write(traceback.format_exc())
@@ -0,0 +1,33 @@
+"""Scenes shared by tests and benchmarks"""
+
+from ragdoll import api
+from ragdoll.vendor import cmdx
+
+
+def chain(length, solver):
+    """Return markers assigned to a chain of `length` transforms"""
+    with cmdx.DagModifier() as mod:
+        parent, transforms = None, []
+        for index in range(length):
+            parent = mod.create_node("transform", parent=parent)
+            mod.set_attr(parent["tx"], 1.0)
+            transforms.append(parent)
+
+    api.assign_markers([t.path() for t in transforms], solver)
+    return [t["message"].output(type="rdMarker") for t in transforms]
+
+
+def sort_by_parent_per_marker(markers):
+    """How internal.sort_by_parent used to walk to the root per marker"""
+    orders = {marker: 0 for marker in markers}
+
+    for marker, order in orders.items():
+        parent = marker["parentMarker"].input(type="rdMarker")
+
+        while parent:
+            order += 1
+            parent = parent["parentMarker"].input()
+
+        orders[marker] = order
+
+    return list(sorted(orders.keys(), key=lambda key: orders[key]))
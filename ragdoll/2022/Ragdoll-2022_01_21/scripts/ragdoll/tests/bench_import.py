@@ -0,0 +1,237 @@
+"""Time taken to import ragdoll.interactive, without Maya
+
+Maya and Qt are replaced by stubs that accept anything, such that what
+remains is the cost of Ragdoll itself. Each import happens in a fresh
+interpreter, once with an empty resource cache and then with a warm one.
+
+Usage:
+    $ python ragdoll/tests/bench_import.py
+    $ python ragdoll/tests/bench_import.py --repeats 20
+
+Exits with 1 if any module meant to be imported on first use
+was imported up-front.
+
+"""
+
+import os
+import sys
+import json
+import time
+import types
+import shutil
+import tempfile
+import argparse
+import subprocess
+
+_scripts = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+_stubs = (
+    "maya",
+    "maya.cmds",
+    "maya.mel",
+    "maya.utils",
+    "maya.debug",
+    "maya.api",
+    "maya.api.OpenMaya",
+    "maya.api.OpenMayaAnim",
+    "maya.api.OpenMayaUI",
+    "maya.OpenMaya",
+    "maya.OpenMayaMPx",
+    "maya.OpenMayaUI",
+    "maya.OpenMayaAnim",
+    "maya.app",
+    "maya.app.general",
+    "maya.app.general.mayaMixin",
+    "PySide2",
+    "PySide2.QtCore",
+    "PySide2.QtGui",
+    "PySide2.QtWidgets",
+    "shiboken2",
+)
+
+# Imported on first use, rather than with ragdoll.interactive
+_lazy = (
+    "ragdoll.ui",
+    "ragdoll.legacy",
+    "ragdoll.vendor.qargparse",
+    "ragdoll.vendor.qjsonmodel",
+    "ragdoll.vendor.markdown",
+)
+
+
+class _StubType(type):
+    """Classes with any attribute, usable as enums and flags"""
+
+    def __getattr__(cls, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        stub = _StubType(name, (Stub,), {})
+        setattr(cls, name, stub)
+        return stub
+
+    def __call__(cls, *args, **kwargs):
+        return type.__call__(cls)
+
+    def __int__(cls):
+        return 2022
+
+    __index__ = __int__
+
+    def __float__(cls):
+        return 1.0
+
+    def __or__(cls, other):
+        return cls
+
+    __ror__ = __and__ = __add__ = __mul__ = __or__
+
+    def __iter__(cls):
+        return iter(())
+
+    def __len__(cls):
+        return 0
+
+
+class Stub(_StubType("_Base", (object,), {})):
+    """Instances with any attribute, returning more stubs"""
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return Stub()
+
+    def __call__(self, *args, **kwargs):
+        return Stub()
+
+    def __getitem__(self, key):
+        return Stub()
+
+    def __iter__(self):
+        return iter(())
+
+    def __int__(self):
+        return 2022
+
+    __index__ = __int__
+
+    def __float__(self):
+        return 1.0
+
+    def __bool__(self):
+        return False
+
+    __nonzero__ = __bool__
+
+    def __len__(self):
+        return 0
+
+    def __str__(self):
+        return ""
+
+    def __fspath__(self):
+        return ""
+
+    def __or__(self, other):
+        return self
+
+    __ror__ = __add__ = __mul__ = __or__
+
+
+class StubModule(types.ModuleType):
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        if name.startswith("MPx"):
+            # Subclassed alongside metaclasses of their own
+            stub = type(name, (object,), {})
+        else:
+            stub = _StubType(name, (Stub,), {})
+
+        setattr(self, name, stub)
+        return stub
+
+
+def _install_stubs():
+    for name in _stubs:
+        sys.modules[name] = StubModule(name)
+        parent, _, child = name.rpartition(".")
+
+        if parent:
+            setattr(sys.modules[parent], child, sys.modules[name])
+
+
+def _child():
+    _install_stubs()
+    sys.path.insert(0, _scripts)
+
+    t0 = time.time()
+    import ragdoll.interactive  # noqa
+    t1 = time.time()
+
+    json.dump({
+        "duration": t1 - t0,
+        "modules": sorted(m for m in sys.modules if m.startswith("ragdoll")),
+    }, sys.stdout)
+
+
+def _run(tempdir):
+    # Resources are cached in the home directory
+    env = dict(os.environ, HOME=tempdir, USERPROFILE=tempdir,
+               TMPDIR=tempdir, TEMP=tempdir, TMP=tempdir)
+    output = subprocess.check_output(
+        [sys.executable, os.path.abspath(__file__), "--child"], env=env
+    )
+    return json.loads(output.decode("utf-8"))
+
+
+def main(repeats=10):
+    cold, warm = [], []
+    modules = []
+
+    for _ in range(repeats):
+        tempdir = tempfile.mkdtemp()
+
+        try:
+            result = _run(tempdir)
+            cold.append(result["duration"])
+            warm.append(_run(tempdir)["duration"])
+            modules = result["modules"]
+        finally:
+            shutil.rmtree(tempdir, ignore_errors=True)
+
+    eager = [
+        module for module in modules
+        if any(module == lazy or module.startswith(lazy + ".")
+               for lazy in _lazy)
+    ]
+
+    cold.sort()
+    warm.sort()
+
+    print("import ragdoll.interactive, %d runs" % repeats)
+    print("  cold cache: %.1fms (median %.1fms)" % (
+        cold[0] * 1000, cold[len(cold) // 2] * 1000))
+    print("  warm cache: %.1fms (median %.1fms)" % (
+        warm[0] * 1000, warm[len(warm) // 2] * 1000))
+    print("  %d ragdoll modules imported" % len(modules))
+
+    for module in eager:
+        print("  - %s was imported up-front" % module)
+
+    return 1 if eager else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--child", action="store_true", help="Internal")
+    opts = parser.parse_args()
+
+    if opts.child:
+        _child()
+    else:
+        sys.exit(main(opts.repeats))
@@ -0,0 +1,727 @@
+"""Time performance-critical paths against their unoptimised equivalent
+
+What these paths do is tested alongside the rest of each module, how
+long they take depends on the machine and is measured here instead.
+
+Usage:
+    $ mayapy ragdoll/tests/bench_performance.py
+    $ mayapy ragdoll/tests/bench_performance.py read_many snapshot
+
+Exits with 1 if any optimised path was slower than what it replaced.
+
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+_scripts = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+
+def _timeit(func, number=1):
+    t0 = time.time()
+
+    for _ in range(number):
+        func()
+
+    return time.time() - t0
+
+
+def _report(name, before, after):
+    print("%s: %.2fms -> %.2fms (%.1fx)" % (
+        name, before * 1000, after * 1000, before / max(after, 1e-9)
+    ))
+
+
+def bench_plug_reuse():
+    from maya import cmds
+    from ragdoll.vendor import cmdx
+    from ragdoll.tests import _new
+
+    _new()
+
+    paths = []
+    for index in range(100):
+        paths += [cmds.createNode("transform", name="node%d" % index)]
+
+    def load():
+        # Mimic dump.Loader, which re-discovers nodes by path
+        for path in paths:
+            node = cmdx.encode(path)
+            node["translateX"].read()
+            node["ry"].read()
+            node["worldMatrix"][0].read()
+
+    cmdx.ENABLE_PLUG_REUSE = False
+    try:
+        cold = _timeit(load, 20)
+    finally:
+        cmdx.ENABLE_PLUG_REUSE = True
+
+    load()  # Warm up
+    warm = _timeit(load, 20)
+
+    yield "encode(path)[attr]", cold, warm
+
+
+def bench_encode_many():
+    from maya import cmds
+    from ragdoll.vendor import cmdx
+    from ragdoll.tests import _new
+
+    _new()
+
+    for index in range(1000):
+        cmds.createNode("transform", name="node%d" % index)
+
+    def one_by_one():
+        list(map(cmdx.encode, cmds.ls(type="transform")))
+
+    def all_at_once():
+        cmdx.ls(type="transform")
+
+    before = _timeit(one_by_one, 10)
+    after = _timeit(all_at_once, 10)
+
+    yield "ls(type=transform)", before, after
+
+
+def bench_read_many():
+    from ragdoll.vendor import cmdx
+    from ragdoll.tests import _new
+
+    _new()
+
+    nodes = [cmdx.createNode("transform") for _ in range(200)]
+    attrs = ("tx", "ry", "sz", "visibility", "rotateOrder")
+    plugs = [node[attr] for node in nodes for attr in attrs]
+
+    def per_plug():
+        for plug in plugs:
+            plug.read()
+
+    def batched():
+        cmdx.read_many(plugs)
+
+    before = _timeit(per_plug, 20)
+    after = _timeit(batched, 20)
+
+    yield "read_many", before, after
+
+
+def bench_read_range():
+    from ragdoll.vendor import cmdx
+    from ragdoll.tests import _new
+
+    _new()
+
+    parent = cmdx.createNode("transform")
+    child = cmdx.createNode("transform", parent=parent)
+    parent["tx"] = {1: 0.0, 100: 10.0}
+    child["ty"] = {1: 0.0, 100: 5.0}
+
+    plug = child["worldMatrix"][0]
+    frames = range(1, 101)
+
+    def per_sample():
+        return [plug.read(time=cmdx.time(frame)) for frame in frames]
+
+    def swept():
+        return plug.read_range(1, 100)
+
+    before = _timeit(per_sample, 10)
+    after = _timeit(swept, 10)
+
+    yield "read_range", before, after
+
+
+def bench_node_hash():
+    from ragdoll.vendor import cmdx
+    from ragdoll.tests import _new
+
+    _new()
+
+    nodes = [cmdx.createNode("transform") for _ in range(100)]
+    cache = {node: index for index, node in enumerate(nodes)}
+    paths = {node.path(): index for index, node in enumerate(nodes)}
+    lookups = nodes * 10000  # 1M
+
+    def by_path():
+        for node in lookups:
+            paths[node.path()]
+
+    def by_node():
+        for node in lookups:
+            cache[node]
+
+    yield "node-keyed dict, 1M lookups", _timeit(by_path), _timeit(by_node)
+
+
+def bench_anim_curves():
+    from ragdoll.vendor import cmdx
+    from ragdoll.tests import _new
+
+    # Mimic recording._Recorder._cache_to_curves, for 500 markers
+    channels = ("tx", "ty", "tz", "rx", "ry", "rz")
+    frames = range(1, 101)
+    keys = {frame: float(frame) for frame in frames}
+    times, values = list(map(cmdx.time, frames)), list(keys.values())
+
+    def nested(nodes):
+        # Previously, each curve was created in a DGModifier of its own
+        for node in nodes:
+            with cmdx.DagModifier() as mod:
+                for channel in channels:
+                    plug = node[channel]
+                    curve_type = cmdx._find_curve_type(plug)
+
+                    with cmdx.DGModifier() as dgmod:
+                        curve = dgmod.create_node(curve_type)
+
+                    mod.connect(curve["output"], plug)
+                    curve.keys(times, values)
+
+                mod.set_attr(node["scale"], (1, 1, 1))
+
+    def batched(nodes):
+        for node in nodes:
+            with cmdx.DagModifier() as mod:
+                for channel in channels:
+                    mod.set_attr(node[channel], keys)
+
+                mod.set_attr(node["scale"], (1, 1, 1))
+
+    durations = []
+    for func in (nested, batched):
+        _new()
+        nodes = [cmdx.createNode("transform") for _ in range(500)]
+        durations.append(_timeit(lambda: func(nodes)))
+
+    yield ("anim curves, 500 markers",) + tuple(durations)
+
+
+def bench_modifier_history():
+    from ragdoll.vendor import cmdx
+    from ragdoll.tests import _new
+
+    _new()
+
+    nodes = [cmdx.createNode("transform") for _ in range(1000)]
+
+    def modify(debug):
+        mod = cmdx.DagModifier(debug=debug)
+
+        for node in nodes:
+            mod.set_attr(node["tx"], 1.0)
+            mod.set_attr(node["ry"], 1.0)
+            mod.connect(node["tx"], node["ty"])
+
+        return mod
+
+    before = _timeit(lambda: modify(True), 5)
+    after = _timeit(lambda: modify(False), 5)
+
+    yield "modifier without history", before, after
+
+
+def _rss():
+    """Peak resident memory of this process, in kB, or 0 if unknown"""
+    try:
+        import resource
+    except ImportError:
+        # Windows
+        return 0
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def bench_encode_soak():
+    from maya import cmds
+    from ragdoll.vendor import cmdx
+    from ragdoll.tests import _new
+
+    _new()
+
+    paths = []
+    for index in range(1000):
+        paths += [cmds.createNode("transform", name="soak%d" % index)]
+
+    def soak():
+        cmdx.clear()
+
+        for cycle in range(1000):  # 1M
+            for path in paths:
+                cmdx.encode(path)
+
+    before = _timeit(soak)
+
+    lazy, size = cmdx.LAZY_LIVENESS, cmdx.NODE_CACHE_SIZE
+    cmdx.LAZY_LIVENESS, cmdx.NODE_CACHE_SIZE = True, 500
+
+    try:
+        rss = _rss()
+        after = _timeit(soak)
+
+        print("encode soak, bounded: %d nodes, +%dkB" % (
+            len(cmdx.Singleton._instances), _rss() - rss
+        ))
+
+    finally:
+        cmdx.LAZY_LIVENESS, cmdx.NODE_CACHE_SIZE = lazy, size
+        cmdx.clear()
+
+    yield "encode soak, 1M, bounded cache", before, after
+
+
+def bench_snapshot():
+    from ragdoll.vendor import cmdx
+    from ragdoll.tests import _new
+
+    _new()
+
+    nodes = [cmdx.createNode("transform") for _ in range(1000)]
+    for a, b in zip(nodes[:-1], nodes[1:]):
+        a["tx"] >> b["ty"]
+
+    attrs = ("tx", "ty", "visibility")
+
+    def walk():
+        # Mimic recording._find_markers, one query at a time
+        for node in cmdx.ls(type="transform"):
+            for attr in attrs:
+                node[attr].read()
+            node["ty"].input(plug=True)
+
+    def snapshot():
+        return cmdx.Snapshot("transform", attributes=attrs, connections=True)
+
+    yield "snapshot, 1000 nodes", _timeit(walk, 5), _timeit(snapshot, 5)
+
+
+def bench_accessor():
+    from ragdoll.vendor import cmdx
+    from ragdoll.tests import _new
+
+    _new()
+
+    nodes = [cmdx.createNode("transform") for _ in range(1000)]
+    accessors = [cmdx.accessor(node) for node in nodes]
+
+    def by_string():
+        for node in nodes:
+            node["tx"], node["rotateY"], node["worldMatrix"]
+
+    def by_accessor():
+        for attrs in accessors:
+            attrs.tx, attrs.rotateY, attrs.worldMatrix
+
+    before = _timeit(by_string, 20)
+    after = _timeit(by_accessor, 20)
+
+    yield "accessor vs. string lookup", before, after
+
+
+def bench_unroll():
+    from maya import cmds
+    from ragdoll import recording
+    from ragdoll.vendor import cmdx
+    from ragdoll.tests import _new
+
+    # A spin about Y, as read back from a matrix, flips at 90 degrees
+    frames = range(1, 201)
+    rotations = [
+        cmdx.Tm(cmdx.EulerRotation(0, cmdx.radians(frame * 5), 0)).rotation()
+        for frame in frames
+    ]
+
+    def keys(node, rotations):
+        with cmdx.DagModifier(debug=False) as mod:
+            for axis in "xyz":
+                mod.set_attr(node["r" + axis], {
+                    frame: getattr(rotation, axis)
+                    for frame, rotation in zip(frames, rotations)
+                })
+
+    def post_pass(nodes):
+        # How recordings were filtered, once all curves were written
+        for node in nodes:
+            keys(node, rotations)
+
+        cmds.filterCurve([
+            node[channel].input().name()
+            for node in nodes for channel in ("rx", "ry", "rz")
+        ], filter="euler")
+
+    def in_memory(nodes):
+        for node in nodes:
+            previous, unrolled = None, []
+            for rotation in rotations:
+                if previous is not None:
+                    rotation = recording._unroll(rotation, previous, 1)
+                unrolled.append(rotation)
+                previous = rotation
+
+            keys(node, unrolled)
+
+    durations = []
+    for func in (post_pass, in_memory):
+        _new()
+        nodes = [cmdx.createNode("transform") for _ in range(100)]
+        durations.append(_timeit(lambda: func(nodes)))
+
+    yield ("unroll, 100 transforms",) + tuple(durations)
+
+
+def bench_sort_by_parent():
+    from ragdoll import api, internal
+    from ragdoll.tests import _new, _builders
+
+    _new()
+    solver = api.create_solver()
+
+    # One 1000-deep chain
+    deep = _builders.chain(1000, solver)
+
+    # And a wide rig, of 200 chains 5-deep
+    wide = []
+    for _ in range(200):
+        wide += _builders.chain(5, solver)
+
+    for name, markers in (("deep", deep), ("wide", wide)):
+        markers = list(reversed(markers))
+        before = _timeit(lambda: _builders.sort_by_parent_per_marker(markers))
+        after = _timeit(lambda: internal.sort_by_parent(markers))
+
+        yield "sort_by_parent, %s" % name, before, after
+
+
+def bench_sort_by_evaluation_order():
+    from maya import cmds
+    from ragdoll import internal
+    from ragdoll.vendor import cmdx
+    from ragdoll.tests import _new
+
+    _new()
+    mode = cmds.evaluationManager(query=True, mode=True)[0]
+    cmds.evaluationManager(mode="parallel")
+
+    try:
+        nodes = []
+        with cmdx.DagModifier() as mod:
+            parent = None
+            for _ in range(100):
+                parent = mod.create_node("transform", parent=parent)
+                nodes.append(parent)
+
+        for node in nodes:
+            node["tx"] = {1: 0.0, 10: 1.0}
+
+        cmdx.current_time(cmdx.time(2))
+
+        def peek():
+            # What every call used to cost
+            internal.uninstall_graph_callbacks()
+            internal.sort_by_evaluation_order(nodes)
+
+        before = _timeit(peek, 10)
+        internal.sort_by_evaluation_order(nodes)  # Warm up
+        after = _timeit(lambda: internal.sort_by_evaluation_order(nodes), 10)
+
+    finally:
+        cmds.evaluationManager(mode=mode)
+
+    yield "sort_by_evaluation_order", before, after
+
+
+def bench_dump_widget_reset():
+    from PySide2 import QtWidgets, QtGui
+    from ragdoll import api, dump, ui
+    from ragdoll.tests import _new, _builders
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    assert app
+
+    _new()
+    solver = api.create_solver()
+    for _ in range(50):
+        _builders.chain(100, solver)
+
+    loader = dump.Loader()
+    loader.read(dump.export())
+
+    widget = ui.DumpWidget()
+    widget._loader = loader
+
+    def uncached(*fname):
+        # How icons used to be made, one per entity row
+        return QtGui.QIcon(ui._resource(*fname))
+
+    cached = ui._icon
+    ui._icon = uncached
+
+    try:
+        before = _timeit(widget._reset)
+    finally:
+        ui._icon = cached
+
+    after = _timeit(widget._reset)
+
+    yield "DumpWidget._reset, 5k entities", before, after
+
+
+def bench_options_read():
+    from ragdoll import options
+
+    key = "importCreateMissingTransforms"
+
+    def uncached():
+        for _ in range(5000):
+            options.clear()
+            options.read(key)
+
+    def cached():
+        for _ in range(5000):
+            options.read(key)
+
+    yield "options.read, 5k rows", _timeit(uncached), _timeit(cached)
+
+
+def bench_options_window():
+    from PySide2 import QtWidgets
+    from ragdoll import interactive, ui
+    from ragdoll.vendor import markdown
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    assert app
+
+    def open_window():
+        interactive.record_markers_options().close()
+
+    # Every conversion as it used to be, with a Markdown of its own
+    rendered = ui.render_markdown
+    ui.render_markdown = markdown.markdown
+
+    try:
+        before = _timeit(open_window, 5)
+    finally:
+        ui.render_markdown = rendered
+
+    open_window()  # Warm up
+    after = _timeit(open_window, 5)
+
+    yield "open options window", before, after
+
+
+def bench_read_json():
+    from ragdoll import internal, interactive
+
+    fname = interactive._resource("options.json")
+
+    def parse():
+        with open(fname) as f:
+            json.load(f)
+
+    internal.read_json(fname)  # Warm up
+    before = _timeit(parse, 50)
+    after = _timeit(lambda: internal.read_json(fname), 50)
+
+    yield "read options.json", before, after
+
+
+def bench_options_install():
+    from ragdoll import options, __
+
+    def per_optionvar():
+        for arg in __.optionvars.values():
+            options.write(arg)
+
+    blob = options.snapshot()
+
+    try:
+        # Every optionvar stored anew, like on first launch
+        reset = _timeit(lambda: options.install(reset=True))
+        before = _timeit(per_optionvar)
+        after = _timeit(lambda: options.install(reset=True))
+        headless = _timeit(lambda: options.install(seed=False))
+
+    finally:
+        options.restore(blob)
+
+    yield "reset %d optionvars" % len(__.optionvars), before, after
+    yield "options.install, headless", reset, headless
+
+
+def bench_telemetry_send():
+    import tempfile
+    import threading
+    from ragdoll import telemetry
+
+    try:
+        from http.server import HTTPServer, BaseHTTPRequestHandler
+    except ImportError:
+        # Python 2
+        from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+
+    class Unresponsive(BaseHTTPRequestHandler):
+        def do_POST(self):
+            time.sleep(1.0)
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Unresponsive)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    url = "http://127.0.0.1:%d" % server.server_port
+    save, deferred = telemetry.save, telemetry._deferred
+
+    # Leave ~/.ragdoll alone
+    pattern = os.path.join(tempfile.mkdtemp(), "deferred_*.json")
+    telemetry.save = lambda data=None: None
+    telemetry._deferred = lambda session="*": pattern.replace("*", session)
+
+    try:
+        # How Maya used to exit, waiting on the upload
+        before = _timeit(lambda: telemetry.upload(url=url))
+        after = _timeit(lambda: telemetry.send(url=url, timeout=0.1))
+
+    finally:
+        telemetry.save, telemetry._deferred = save, deferred
+        server.shutdown()
+        server.server_close()
+
+    yield "exit, unresponsive telemetry server", before, after
+
+
+def bench_counters():
+    from ragdoll import internal
+
+    def feed():
+        internal.reset_counters()
+        for index in range(100000):
+            internal.count("bench.counters", index * 1e-6)
+
+    # Every duration kept, as though unbounded
+    size = internal._counter_samples
+    internal._counter_samples = sys.maxsize
+
+    try:
+        feed()
+        before = _timeit(internal.counters, 10)
+    finally:
+        internal._counter_samples = size
+
+    feed()
+    after = _timeit(internal.counters, 10)
+
+    def timers(name):
+        for _ in range(100000):
+            with internal.Timer(name):
+                pass
+
+    # What counting adds to each named Timer
+    overhead = _timeit(lambda: timers("bench.timer"))
+    overhead -= _timeit(lambda: timers(""))
+    print("named Timer, counted: +%.2fus per call" % (overhead * 10))
+
+    internal.reset_counters()
+
+    yield "counters(), 100k samples", before, after
+
+
+def bench_record_throttle():
+    from ragdoll import api, interactive, recording
+    from ragdoll.vendor import cmdx
+    from ragdoll.tests import _new, _builders
+
+    frames = 1000
+
+    def record(interval):
+        _new(1, frames)
+        solver = api.create_solver()
+        for _ in range(10):
+            _builders.chain(10, solver)
+
+        recorder = recording._Recorder(cmdx.encode(solver))
+
+        def run():
+            # Mimic interactive.record_markers
+            with interactive.progressbar(interval=interval) as p:
+                for step, progress in recorder.record():
+                    p.update(progress, step)
+
+        return _timeit(run)
+
+    before, after = record(0), record(None)
+
+    for state, duration in (("off", before), ("on", after)):
+        print("record, throttling %s: %d fps" % (state, frames / duration))
+
+    yield "record %d frames, 100 markers" % frames, before, after
+
+
+_benchmarks = (
+    bench_plug_reuse,
+    bench_encode_many,
+    bench_read_many,
+    bench_read_range,
+    bench_node_hash,
+    bench_anim_curves,
+    bench_modifier_history,
+    bench_encode_soak,
+    bench_snapshot,
+    bench_accessor,
+    bench_unroll,
+    bench_sort_by_parent,
+    bench_sort_by_evaluation_order,
+    bench_dump_widget_reset,
+    bench_options_read,
+    bench_options_window,
+    bench_read_json,
+    bench_options_install,
+    bench_telemetry_send,
+    bench_counters,
+    bench_record_throttle,
+)
+
+
+def main(names=None):
+    import maya.standalone
+    maya.standalone.initialize()
+
+    from ragdoll import interactive
+    interactive.install()
+
+    slower = []
+
+    for bench in _benchmarks:
+        if names and bench.__name__[len("bench_"):] not in names:
+            continue
+
+        for name, before, after in bench():
+            _report(name, before, after)
+
+            if after > before:
+                slower.append(name)
+
+    for name in slower:
+        print("  - %s was slower than before" % name)
+
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("names", nargs="*", help="E.g. read_many")
+    opts = parser.parse_args()
+
+    sys.path.insert(0, _scripts)
+    sys.exit(main(opts.names))
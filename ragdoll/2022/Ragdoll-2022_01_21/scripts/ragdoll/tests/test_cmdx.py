@@ -0,0 +1,290 @@
+"""cmdx finds, reads and writes what Maya has, only faster"""
+
+from maya import cmds
+from ragdoll.vendor import cmdx
+
+from . import _new
+
+from nose.tools import (
+    assert_equals,
+    assert_less,
+)
+
+
+def test_plug_reuse_across_encode():
+    _new()
+
+    paths = []
+    for index in range(100):
+        paths += [cmds.createNode("transform", name="node%d" % index)]
+
+    def load():
+        # Mimic dump.Loader, which re-discovers nodes by path
+        for path in paths:
+            node = cmdx.encode(path)
+            node["translateX"].read()
+            node["ry"].read()
+            node["worldMatrix"][0].read()
+
+    cmdx.ENABLE_PLUG_REUSE = False
+    try:
+        count = cmdx.Stats.PlugReuseCount
+        load()
+        assert_equals(cmdx.Stats.PlugReuseCount, count)
+    finally:
+        cmdx.ENABLE_PLUG_REUSE = True
+
+    load()  # Warm up
+    count = cmdx.Stats.PlugReuseCount
+    load()
+
+    assert_less(count, cmdx.Stats.PlugReuseCount)
+
+
+def test_plug_reuse_long_and_short():
+    _new()
+
+    node = cmdx.createNode("transform")
+    long_ = node.findPlug("translateX")
+    short = node.findPlug("tx")
+
+    # Both are the exact same plug
+    assert long_ is short
+
+    # Destroyed nodes take their plugs with them
+    hash_code = node.hashCode
+    _new()
+    assert_equals(
+        [key for key in cmdx._plugCache._plugs if key[0] == hash_code], []
+    )
+
+
+def test_encode_many():
+    _new()
+
+    paths = []
+    for index in range(1000):
+        paths += [cmds.createNode("transform", name="node%d" % index)]
+
+    # Misses and duplicates are fine
+    nodes = cmdx.encode_many(paths[:2] + ["notExist"] + paths[:1])
+    assert_equals(nodes, [
+        cmdx.encode(paths[0]), cmdx.encode(paths[1]), None,
+        cmdx.encode(paths[0])
+    ])
+
+    assert_equals(
+        cmdx.ls(type="transform"),
+        list(map(cmdx.encode, cmds.ls(type="transform")))
+    )
+    assert_equals(len(cmdx.ls(type="transform")), len(paths) + 4)
+
+
+def test_read_many():
+    _new()
+
+    nodes = [cmdx.createNode("transform") for _ in range(200)]
+    attrs = ("tx", "ry", "sz", "visibility", "rotateOrder")
+    pairs = [(node, attr) for node in nodes for attr in attrs]
+    plugs = [node[attr] for node, attr in pairs]
+
+    expected = [plug.read() for plug in plugs]
+    assert_equals(cmdx.read_many(pairs), expected)
+    assert_equals(cmdx.read_many(plugs), expected)
+
+
+def test_read_range():
+    _new()
+
+    parent = cmdx.createNode("transform")
+    child = cmdx.createNode("transform", parent=parent)
+    parent["tx"] = {1: 0.0, 100: 10.0}
+    parent["ry"] = {1: 0.0, 100: 3.0}
+    child["ty"] = {1: 0.0, 100: 5.0}
+
+    plug = child["worldMatrix"][0]
+    frames = range(1, 101)
+
+    def per_sample():
+        return [plug.read(time=cmdx.time(frame)) for frame in frames]
+
+    def swept():
+        return plug.read_range(1, 100)
+
+    assert_equals(per_sample(), swept())
+    assert_equals(cmdx.current_time(), cmdx.time(1))
+
+    plugs = [parent["tx"], parent["ry"], child["ty"], plug]
+    values = cmdx.read_many_range(plugs, 1, 100)
+    assert_equals(values[-1], swept())
+    assert_equals(values[0][-1], 10.0)
+
+
+def test_node_hash():
+    _new()
+
+    nodes = [cmdx.createNode("transform") for _ in range(100)]
+    cache = {node: index for index, node in enumerate(nodes)}
+
+    # The same node, however it was found, is the same key
+    for index, node in enumerate(nodes):
+        assert_equals(hash(node), node.hashCode)
+        assert_equals(cache[cmdx.encode(node.path())], index)
+
+    assert_equals(len(cache), len(nodes))
+
+    # Names are not nodes, as their hash would differ
+    assert nodes[0] != str(nodes[0])
+    assert str(nodes[0]) not in cache
+
+
+def test_anim_curves_in_dagmodifier():
+    # Mimic recording._Recorder._cache_to_curves, for 500 markers
+    channels = ("tx", "ty", "tz", "rx", "ry", "rz")
+    frames = range(1, 101)
+    keys = {frame: float(frame) for frame in frames}
+
+    _new()
+    nodes = [cmdx.createNode("transform") for _ in range(500)]
+
+    for node in nodes:
+        with cmdx.DagModifier() as mod:
+            for channel in channels:
+                mod.set_attr(node[channel], keys)
+
+            mod.set_attr(node["scale"], (1, 1, 1))
+
+    assert_equals(nodes[0]["tx"].read(time=cmdx.time(50)), 50.0)
+    assert_equals(len(cmds.ls(type="animCurve")), 500 * len(channels))
+
+    # Undo removes curves and keys alike
+    cmds.undo()
+    assert_equals(nodes[-1]["tx"].input(), None)
+    cmds.redo()
+    assert_equals(nodes[-1]["tx"].read(time=cmdx.time(50)), 50.0)
+
+
+def test_modifier_history():
+    _new()
+
+    nodes = [cmdx.createNode("transform") for _ in range(1000)]
+
+    def modify(debug):
+        mod = cmdx.DagModifier(debug=debug)
+
+        for node in nodes:
+            mod.set_attr(node["tx"], 1.0)
+            mod.set_attr(node["ry"], 1.0)
+            mod.connect(node["tx"], node["ty"])
+
+        return mod
+
+    # History is bounded, and only recorded when asked for
+    assert_equals(len(modify(True)._history), cmdx.HISTORY_SIZE)
+    assert_equals(len(modify(False)._history), 0)
+
+
+def test_encode_soak():
+    _new()
+
+    paths = []
+    for index in range(1000):
+        paths += [cmds.createNode("transform", name="soak%d" % index)]
+
+    lazy, size = cmdx.LAZY_LIVENESS, cmdx.NODE_CACHE_SIZE
+    cmdx.LAZY_LIVENESS, cmdx.NODE_CACHE_SIZE = True, 500
+
+    try:
+        cmdx.clear()
+
+        for cycle in range(10):
+            for path in paths:
+                cmdx.encode(path)
+
+            assert len(cmdx.Singleton._instances) <= cmdx.NODE_CACHE_SIZE
+
+        # Nodes in use are the same nodes, evicted or not
+        node = cmdx.encode(paths[0])
+        for path in paths:
+            cmdx.encode(path)
+
+        assert node._hexStr not in cmdx.Singleton._instances
+        assert cmdx.encode(paths[0]) is node
+
+        # Liveness is still known, without a callback
+        assert_equals(node._state["callbacks"], [])
+        cmds.delete(paths[0])
+        assert node.destroyed
+
+    finally:
+        cmdx.LAZY_LIVENESS, cmdx.NODE_CACHE_SIZE = lazy, size
+        cmdx.clear()
+
+
+def test_node_cache_size_is_lazy_only():
+    _new()
+
+    paths = [cmds.createNode("transform") for _ in range(20)]
+    size = cmdx.NODE_CACHE_SIZE
+    cmdx.NODE_CACHE_SIZE = 10
+
+    try:
+        cmdx.clear()
+        nodes = [cmdx.encode(path) for path in paths]
+
+        # Each is told when it is destroyed, and kept around
+        assert_equals(len(cmdx.Singleton._instances), len(paths))
+        assert all(node._state["callbacks"] for node in nodes)
+
+    finally:
+        cmdx.NODE_CACHE_SIZE = size
+        cmdx.clear()
+
+
+def test_snapshot():
+    _new()
+
+    nodes = [cmdx.createNode("transform") for _ in range(1000)]
+    for a, b in zip(nodes[:-1], nodes[1:]):
+        a["tx"] >> b["ty"]
+
+    attrs = ("tx", "ty", "visibility")
+
+    def snapshot():
+        return cmdx.Snapshot("transform", attributes=attrs, connections=True)
+
+    first = snapshot()
+    assert_equals(len(first.connections()), len(nodes) - 1)
+
+    nodes[10]["visibility"] = False
+    nodes[0]["tx"] // nodes[1]["ty"]
+    cmds.delete(str(nodes[20]))
+    added = cmdx.createNode("transform")
+
+    diff = snapshot().diff(first)
+    assert_equals(diff["added"], [added])
+    assert_equals(diff["removed"], [nodes[20]])
+    assert_equals(diff["changed"], {nodes[10]: {"visibility": (True, False)}})
+    assert_equals(len(diff["disconnected"]), 3)
+    assert_equals(diff["connected"], set())
+
+
+def test_accessor():
+    _new()
+
+    nodes = [cmdx.createNode("transform") for _ in range(1000)]
+    accessors = [cmdx.accessor(node) for node in nodes]
+
+    assert_equals(accessors[0].tx, nodes[0]["tx"])
+    assert_equals(accessors[0]["rotateY"], nodes[0]["rotateY"])
+
+    # Attributes are plugs, even when named like a member
+    nodes[0]["node"] = cmdx.Double(default=2.0)
+    assert_equals(accessors[0]["node"].read(), 2.0)
+    assert_equals(accessors[0].node, nodes[0])
+
+    # Attributes of plug-in nodes are forgotten with their plug-in
+    cmdx.accessor_type("rdSolver")
+    assert "rdSolver" in cmdx._accessorTypes
+    cmdx.uninstall()
+    assert_equals(cmdx._accessorTypes, {})
@@ -0,0 +1,57 @@
+"""Menu items report progress without slowing down what they do"""
+
+from maya import cmds
+from ragdoll import api, commands, interactive
+from ragdoll.vendor import cmdx
+
+from . import _new, _builders
+
+from nose.tools import (
+    assert_equals,
+)
+
+
+def test_progress_throttle():
+    _new(1, 500)
+    solver = api.create_solver()
+    _builders.chain(10, solver)
+    solvers = [cmdx.encode(solver)]
+
+    # There is no progress bar in batch mode, record would-be calls instead
+    calls = []
+    progressbar = cmds.progressBar
+    cmds.progressBar = lambda *args, **kwargs: calls.append(kwargs) and False
+
+    def reported():
+        progress = [call["progress"] for call in calls if call.get("edit")]
+        calls[:] = []
+        return progress
+
+    def cache(interval):
+        p = interactive._Progress("mainProgressBar", interval=interval)
+        for progress in commands.cache(solvers):
+            if not p.update(progress):
+                break
+
+        p.flush()
+        return reported()
+
+    try:
+        every_frame = cache(0)
+        throttled = cache(60)
+
+        # The first and last update, no matter how long it took
+        assert_equals(throttled, [every_frame[0], every_frame[-1]])
+
+        # Along with the first update of every step
+        p = interactive._Progress("mainProgressBar", interval=60)
+        p.update(10, "simulating")
+        p.update(20, "simulating")
+        p.update(30, "baking")
+        p.update(40, "baking")
+        p.flush()
+
+        assert_equals(reported(), [10, 30, 40])
+
+    finally:
+        cmds.progressBar = progressbar
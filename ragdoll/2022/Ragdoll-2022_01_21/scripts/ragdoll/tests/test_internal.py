@@ -0,0 +1,142 @@
+"""Helpers shared by recording, export and the UI"""
+
+import os
+import json
+import marshal
+
+from maya import cmds
+from ragdoll import api, internal, interactive, recording
+from ragdoll.vendor import cmdx
+
+from . import _new, _builders
+
+from nose.tools import (
+    assert_equals,
+    assert_less,
+)
+
+
+def test_sort_by_parent():
+    _new()
+    solver = api.create_solver()
+
+    # One 1000-deep chain
+    deep = _builders.chain(1000, solver)
+
+    # And a wide rig, of 200 chains 5-deep
+    wide = []
+    for _ in range(200):
+        wide += _builders.chain(5, solver)
+
+    for markers in (deep, wide):
+        markers = list(reversed(markers))
+        expected = _builders.sort_by_parent_per_marker(markers)
+        assert_equals(internal.sort_by_parent(markers), expected)
+
+        # The same, from parents found before
+        topology = internal.Topology(markers)
+        assert_equals(internal.sort_by_parent(markers, topology), expected)
+
+
+def test_sort_by_evaluation_order():
+    _new()
+    mode = cmds.evaluationManager(query=True, mode=True)[0]
+    cmds.evaluationManager(mode="parallel")
+
+    peeks = []
+    peek = internal._peek_evaluation_order
+
+    def counted(names):
+        peeks.append(names)
+        return peek(names)
+
+    try:
+        nodes = []
+        with cmdx.DagModifier() as mod:
+            parent = None
+            for _ in range(100):
+                parent = mod.create_node("transform", parent=parent)
+                nodes.append(parent)
+
+        for node in nodes:
+            node["tx"] = {1: 0.0, 10: 1.0}
+
+        cmdx.current_time(cmdx.time(2))
+        reverse = list(reversed(nodes))
+
+        # Names of nodes are looked up as-is, under Python 2 and 3
+        result = internal.sort_by_evaluation_order(reverse)
+        assert_equals(len(result), len(nodes))
+        assert_less(result.index(nodes[0]), result.index(nodes[-1]))
+
+        # The graph is peeked at once, until it changes
+        internal._peek_evaluation_order = counted
+        assert_equals(internal.sort_by_evaluation_order(reverse), result)
+        assert_equals(peeks, [])
+
+        cmdx.createNode("transform")
+        assert_equals(internal.sort_by_evaluation_order(reverse), result)
+        assert_equals(len(peeks), 1)
+
+        cmds.evaluationManager(mode="serial")
+        internal.sort_by_evaluation_order(reverse)
+        assert_equals(len(peeks), 2)
+
+    finally:
+        internal._peek_evaluation_order = peek
+        cmds.evaluationManager(mode=mode)
+
+
+def test_read_json():
+    fname = interactive._resource("options.json")
+
+    with open(fname) as f:
+        expected = json.load(f)
+
+    # Once parsed, and once more from cache
+    assert_equals(internal.read_json(fname), expected)
+    assert_equals(internal.read_json(fname), expected)
+
+    # A corrupt cache is parsed anew
+    cache = internal._json_cache(fname)
+    with open(cache, "wb") as f:
+        f.write(b"\xff" * 16)
+
+    assert_equals(internal.read_json(fname), expected)
+
+    # As is one anyone could have written
+    if hasattr(os, "getuid"):
+        with open(cache, "rb") as f:
+            key, _ = marshal.loads(f.read())
+
+        with open(cache, "wb") as f:
+            f.write(marshal.dumps((key, {"planted": True})))
+
+        os.chmod(cache, 0o666)
+        assert_equals(internal.read_json(fname), expected)
+
+
+def test_performance_counters():
+    _new(1, 50)
+    solver = api.create_solver()
+    _builders.chain(10, solver)
+
+    internal.reset_counters()
+    recording.record(cmdx.encode(solver))
+
+    counters = internal.counters()
+    assert_equals(counters["recording._sim_to_cache"]["count"], 1)
+    assert_less(0, counters["recording._sim_to_cache"]["frames"])
+    assert_less(0, counters["recording._bake"]["total"])
+
+    # Only named timers are counted
+    for _ in range(100):
+        with internal.Timer("tests.timed"):
+            pass
+
+        with internal.Timer():
+            pass
+
+    counters = internal.counters()
+    assert_equals(counters["tests.timed"]["count"], 100)
+    assert "" not in counters
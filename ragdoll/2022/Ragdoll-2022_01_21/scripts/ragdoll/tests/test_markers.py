@@ -1,8 +1,8 @@
-from nose.tools import assert_almost_equals
+from nose.tools import assert_almost_equals, assert_equals, assert_less
 from ragdoll.vendor import cmdx
-from ragdoll import interactive as ri
+from ragdoll import interactive as ri, api, constants, internal, recording
 from maya import cmds
-from . import _new, _step
+from . import _new, _step, _builders
 
 
 def test_uniform_scale():
@@ -315,3 +315,86 @@ def test_locked_rotate_channels():
 
     # The default limit around the remaining unlocked axis is 45 degrees
     assert_almost_equals(b["rz", cmdx.Degrees].read(), -45.0, 0)
+
+
+def test_rotation_filter():
+    for rotation_filter in (1, 2):
+        _new(1, 50)
+
+        solver = api.createSolver()
+        a = cmds.createNode("transform", name="a")
+        b = cmds.createNode("transform", name="b")
+        marker = api.assignMarker(a, solver)
+        api.retargetMarker(marker, b)
+
+        marker = cmdx.encode(marker)
+        marker["inputType"] = constants.InputKinematic
+
+        # Two whole turns, which flip once read back from a matrix
+        cmds.setKeyframe(a, attribute="ry", time=1, value=0)
+        cmds.setKeyframe(a, attribute="ry", time=50, value=720)
+
+        api.recordPhysics(solver, opts={
+            "rotationFilter": rotation_filter,
+            "includeKinematic": True,
+            "toLayer": False,
+        })
+
+        b = cmdx.encode(b)
+        previous = b["rotate"].read(time=cmdx.time(1))
+
+        for frame in range(2, 50):
+            rotation = b["rotate"].read(time=cmdx.time(frame))
+            delta = max(abs(x - y) for x, y in zip(rotation, previous))
+            assert_less(delta, cmdx.radians(45), (
+                "Rotation flipped on frame %d with filter %d"
+                % (frame, rotation_filter)
+            ))
+            previous = rotation
+
+
+def test_unroll_in_memory():
+    # A spin about Y, as read back from a matrix, flips at 90 degrees
+    frames = range(1, 201)
+    rotations = [
+        cmdx.Tm(cmdx.EulerRotation(0, cmdx.radians(frame * 5), 0)).rotation()
+        for frame in frames
+    ]
+
+    def unroll(mode):
+        previous, unrolled = None, []
+        for rotation in rotations:
+            if previous is not None:
+                rotation = recording._unroll(rotation, previous, mode)
+            unrolled.append(rotation)
+            previous = rotation
+        return unrolled
+
+    for mode in (1, 2):
+        unrolled = unroll(mode)
+        for a, b in zip(unrolled[:-1], unrolled[1:]):
+            assert_less(abs(b.y - a.y) + abs(b.x - a.x), cmdx.radians(10))
+
+
+def test_kinematic_hierarchy():
+    _new()
+    solver = api.create_solver()
+    markers = _builders.chain(100, solver)
+    solver = cmdx.encode(solver)
+
+    topology = internal.Topology(recording._find_markers(solver))
+    assert_equals(topology.roots(), [markers[0]])
+    assert_equals(topology.children(markers[0]), [markers[1]])
+    assert_equals(recording._find_markers(solver, topology=topology),
+                  topology.markers)
+
+    mapping = recording._generate_kinematic_hierarchy(
+        solver, tips=True, topology=topology)
+
+    assert_equals(len(mapping), 100)
+    assert_equals(mapping[markers[1]].parent(), mapping[markers[0]])
+    assert_equals(len(cmds.ls("*_tip", type="joint")), 1)
+
+    # All of it, in one undo
+    cmds.undo()
+    assert_equals(cmds.ls(type="joint"), [])
@@ -0,0 +1,79 @@
+"""Options are read from and written to Maya's optionVar store"""
+
+from maya import cmds
+from ragdoll import options
+
+from nose.tools import (
+    assert_equals,
+)
+
+
+def test_options_read():
+    key = "importCreateMissingTransforms"
+    initial = options.read(key)
+
+    try:
+        # Writes are seen by the next read
+        options.write(key, False)
+        assert_equals(options.read(key), False)
+        options.write(key, True)
+        assert_equals(options.read(key), True)
+
+        hits = options.stats()["hits"]
+        for _ in range(5000):
+            options.read(key)
+
+        assert_equals(options.stats()["hits"] - hits, 5000)
+
+    finally:
+        options.write(key, initial)
+
+
+def test_install_headless():
+    key = options._optionvarkey("scale")
+    initial = options.snapshot()
+
+    try:
+        # Nothing is stored without seeding
+        cmds.optionVar(remove=key)
+        options.clear()
+        options.install(seed=False)
+        assert not cmds.optionVar(exists=key)
+
+        # Defaults are read whether or not they were stored
+        assert_equals(options.read("scale"), 1.0)
+
+    finally:
+        options.restore(initial)
+
+
+def test_options_write_many():
+    blob = options.snapshot()
+    calls = []
+    optionvar = cmds.optionVar
+
+    def counted(*args, **kwargs):
+        calls.append(kwargs)
+        return optionvar(*args, **kwargs)
+
+    try:
+        # Only what changed is written
+        options.write("scale", 2.0)
+        cmds.optionVar = counted
+        options.install(reset=True)
+        assert_equals(
+            [call for call in calls if "floatValue" in call],
+            [{"floatValue": [("ragdollScale", 1.0)]}]
+        )
+
+        # An empty array is no array
+        cmds.optionVar = optionvar
+        options._write_stored({"ragdollTestArray": ["a", "b"]})
+        options._write_stored({"ragdollTestArray": []})
+        assert not cmds.optionVar(exists="ragdollTestArray")
+
+    finally:
+        cmds.optionVar = optionvar
+        options.restore(blob)
+
+    assert_equals(options.snapshot(), blob)
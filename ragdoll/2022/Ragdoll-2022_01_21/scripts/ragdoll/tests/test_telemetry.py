@@ -0,0 +1,111 @@
+"""Telemetry never holds up Maya on exit"""
+
+import os
+import glob
+import json
+import time
+import tempfile
+import threading
+
+from ragdoll import telemetry, __
+
+from nose.tools import (
+    assert_equals,
+    assert_less,
+)
+
+try:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+except ImportError:
+    # Python 2
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+
+
+def test_telemetry_send():
+    received = []
+    released = threading.Event()
+
+    class Standin(BaseHTTPRequestHandler):
+        delay = 0
+
+        def do_POST(self):
+            released.wait(Standin.delay)
+            length = int(self.headers["Content-Length"])
+            received.append(json.loads(self.rfile.read(length)))
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Standin)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    url = "http://127.0.0.1:%d" % server.server_port
+    save = telemetry.save
+    telemetry.save = lambda data=None: None
+
+    dirname = tempfile.mkdtemp()
+    pattern = os.path.join(dirname, "deferred_*.json")
+
+    deferred = telemetry._deferred
+    telemetry._deferred = lambda session="*": pattern.replace("*", session)
+
+    # Batch mode opts out, tested below
+    opted_out = telemetry._opted_out
+    telemetry._opted_out = lambda: False
+
+    upload = telemetry.upload
+    uploaded = []
+
+    try:
+        telemetry.send(url=url, timeout=5).join()
+        expected = json.loads(json.dumps(__.telemetry_data))
+        assert_equals(received, [expected])
+
+        # Exit waits no longer than the timeout, and tries again next time
+        Standin.delay = 2.0
+        t0 = time.time()
+        busy = telemetry.send(url=url, timeout=0.1)
+        assert_less(time.time() - t0, 1.0)
+
+        busy.join()
+        assert_equals(len(glob.glob(pattern)), 1)
+        released.set()
+
+        # Without a url, the plug-in uploads on exit, along with
+        # what was deferred before
+        telemetry.upload = lambda data=None, *args: uploaded.append(data)
+        telemetry.send(timeout=5).join()
+        assert_equals(uploaded, [expected, expected])
+        assert_equals(glob.glob(pattern), [])
+
+        # Every session defers to a file of its own
+        del uploaded[:]
+        telemetry.defer(expected)
+        telemetry.defer(expected)
+        assert_equals(len(glob.glob(pattern)), 2)
+
+        # Nothing is uploaded past the deadline, or when opted out
+        telemetry.upload_deferred(deadline=time.time() - 1)
+        telemetry._opted_out = lambda: True
+        telemetry.upload_deferred()
+        assert_equals(uploaded, [])
+
+        telemetry._opted_out = lambda: False
+        telemetry.upload_deferred()
+        assert_equals(uploaded, [expected, expected])
+        assert_equals(glob.glob(pattern), [])
+
+    finally:
+        telemetry.save = save
+        telemetry.upload = upload
+        telemetry._deferred = deferred
+        telemetry._opted_out = opted_out
+
+        # Let the unresponsive request go, for shutdown to finish
+        released.set()
+        server.shutdown()
+        server.server_close()
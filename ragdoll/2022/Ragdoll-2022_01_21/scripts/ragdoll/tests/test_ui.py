@@ -0,0 +1,50 @@
+"""Windows open quickly, from what was loaded and rendered before"""
+
+from PySide2 import QtWidgets
+from ragdoll import api, dump, interactive, ui, __
+from ragdoll.vendor import markdown
+
+from . import _new, _builders
+
+from nose.tools import (
+    assert_equals,
+)
+
+
+def setup():
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    assert app
+
+
+def test_dump_widget_reset():
+    _new()
+    solver = api.create_solver()
+    for _ in range(50):
+        _builders.chain(100, solver)
+
+    loader = dump.Loader()
+    loader.read(dump.export())
+
+    widget = ui.DumpWidget()
+    widget._loader = loader
+
+    # Icons are made once, and shared by every entity row
+    widget._reset()
+    icons = dict(ui._icons)
+    widget._reset()
+
+    assert_equals(ui._icons, icons)
+    assert ui._icon("icons", "solver.png") is ui._icon("icons", "solver.png")
+
+
+def test_options_window():
+    interactive.record_markers_options().close()
+
+    # Help is rendered ahead of time, messages are not remembered
+    arg = __.optionvars["markersRecordFilter"]
+    assert ui._markdown_key(arg["help"]) in ui._markdown_html
+
+    text = "Some **bold** text"
+    assert_equals(ui.render_markdown(text, remember=False),
+                  markdown.markdown(text))
+    assert ui._markdown_key(text) not in ui._markdown_html
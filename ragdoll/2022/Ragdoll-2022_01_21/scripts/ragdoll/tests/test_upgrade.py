@@ -0,0 +1,88 @@
+"""Legacy scenes are brought up to date"""
+
+from maya import cmds
+from ragdoll import upgrade
+from ragdoll.vendor import cmdx
+
+from . import _new, _open, _scene
+
+from nose.tools import (
+    assert_equals,
+    assert_greater,
+    assert_less,
+    assert_raises,
+)
+
+
+def test_upgrade_multipliers():
+    _new()
+    _open(_scene("multipliers_pre20210411.ma"))
+
+    _, count = upgrade.needs_upgrade()
+    assert_greater(count, 0)
+
+    upgraded = upgrade.upgrade_all()
+    assert_greater(upgraded, 0)
+
+    _, count = upgrade.needs_upgrade()
+    assert_equals(count, 0)
+
+
+def _state():
+    """Scalar values and incoming connections of every Ragdoll node"""
+    types = ("rdScene",
+             "rdRigid",
+             "rdRigidMultiplier",
+             "rdConstraint",
+             "rdConstraintMultiplier")
+
+    attributes = set()
+    for path in cmds.ls(type=types):
+        attributes.update(
+            attr for attr in cmds.listAttr(path, scalar=True) or []
+            if "." not in attr
+        )
+
+    return cmdx.Snapshot(types, attributes=attributes, connections=True)
+
+
+def _failing(func):
+    """Upgrade the first node with `func`, then fail"""
+
+    def failing(*args, **kwargs):
+        func(*args, **kwargs)
+        raise RuntimeError("Failed part-way")
+
+    return failing
+
+
+def test_upgrade_transactional():
+    _new()
+    _open(_scene("multipliers_pre20210411.ma"))
+
+    before = _state()
+    _, count = upgrade.needs_upgrade()
+
+    # Scenes, rigids and rigid multipliers are upgraded
+    # by the time constraint multipliers fail
+    constraint_multiplier = upgrade.constraint_multiplier
+    upgrade.constraint_multiplier = _failing(constraint_multiplier)
+
+    try:
+        assert_raises(RuntimeError, upgrade.upgrade_all, transactional=True)
+
+        # Nothing was applied
+        diff = _state().diff(before)
+        assert_equals(diff["added"], [])
+        assert_equals(diff["removed"], [])
+        assert_equals(diff["changed"], {})
+        assert_equals(diff["connected"], set())
+        assert_equals(diff["disconnected"], set())
+        assert_equals(upgrade.needs_upgrade()[1], count)
+
+        # Whereas without a transaction, the others are upgraded regardless
+        upgrade.upgrade_all()
+        assert_less(upgrade.needs_upgrade()[1], count)
+
+    finally:
+        upgrade.constraint_multiplier = constraint_multiplier
@@ -4,6 +4,7 @@ import sys
 import time
 import json
 import ctypes
+import hashlib
 import logging
 import datetime
 import webbrowser
@@ -29,6 +30,8 @@ log = logging.getLogger("ragdoll")
 
 self = sys.modules[__name__]
 self._maya_window = None
+self._markdown = None  # Shared instance, see render_markdown()
+self._markdown_html = None  # By hash of markdown, loaded on first use
 
 px = MQtUtil.dpiScale
 
@@ -65,6 +68,160 @@ def _resource(*fname):
     return os.path.normpath(os.path.join(resdir, *fname))
 
 
+# Shared by every widget, keyed by (path, size, dpi scale)
+_icons = {}
+_pixmaps = {}
+
+
+def _pixmap(*fname, **kwargs):
+    """Return pixmap of resource `fname`, scaled once and cached
+
+    Arguments:
+        width (int, optional): Scale to this width, before DPI scaling
+        height (int, optional): Also fit within this height
+
+    """
+
+    width = kwargs.get("width")
+    height = kwargs.get("height")
+    key = (fname, width, height, px(1.0))
+
+    try:
+        return _pixmaps[key]
+    except KeyError:
+        pass
+
+    pixmap = QtGui.QPixmap(_resource(*fname))
+
+    if width and height:
+        pixmap = pixmap.scaled(
+            px(width), px(height),
+            QtCore.Qt.KeepAspectRatio,
+            QtCore.Qt.SmoothTransformation
+        )
+
+    elif width:
+        pixmap = pixmap.scaledToWidth(
+            px(width), QtCore.Qt.SmoothTransformation
+        )
+
+    _pixmaps[key] = pixmap
+    return pixmap
+
+
+def _icon(*fname):
+    """Return icon of resource `fname`, loaded once and cached"""
+    key = (fname, None, px(1.0))
+
+    try:
+        return _icons[key]
+    except KeyError:
+        icon = _icons[key] = QtGui.QIcon(_resource(*fname))
+        return icon
+
+
+def _preload_icons():
+    """Load every icon of the icons directory, ahead of first use"""
+    for fname in os.listdir(_resource("icons")):
+        if fname.endswith(".png"):
+            _icon("icons", fname)
+
+
+def render_markdown(text, remember=True):
+    """Return HTML of markdown `text`
+
+    Help of menu.json and options.json is rendered ahead of time, see
+    prerender_markdown(). Anything else is rendered by one shared
+    Markdown instance, and remembered until Maya quits unless
+    `remember` is False.
+
+    """
+
+    if self._markdown_html is None:
+        self._markdown_html = _load_markdown()
+
+    key = _markdown_key(text)
+
+    try:
+        return self._markdown_html[key]
+    except KeyError:
+        pass
+
+    html = _convert_markdown(text)
+
+    if remember:
+        self._markdown_html[key] = html
+
+    return html
+
+
+def _markdown_key(text):
+    data = text if isinstance(text, bytes) else text.encode("utf-8")
+    return hashlib.sha1(data).hexdigest()
+
+
+def _convert_markdown(text):
+    if self._markdown is None:
+        self._markdown = markdown.Markdown()
+
+    return self._markdown.reset().convert(text)
+
+
+def _load_markdown():
+    try:
+        with open(_resource("markdown.json")) as f:
+            cache = json.load(f)
+
+    except (IOError, OSError, ValueError):
+        return {}
+
+    # Another version of markdown may render differently
+    if cache.get("version") != markdown.__version__:
+        return {}
+
+    return cache["html"]
+
+
+def prerender_markdown(fname=None):
+    """Render help of menu.json and options.json into markdown.json
+
+    Run this whenever either of them change, as part of building
+    a package. Ragdoll only ever reads the result.
+
+    $ mayapy -c "from ragdoll import ui;ui.prerender_markdown()"
+
+    """
+
+    texts = []
+
+    for name in ("menu.json", "options.json"):
+        for item in i__.read_json(_resource(name)).values():
+            if not isinstance(item, dict):
+                continue  # E.g. "#" comments
+
+            texts += [
+                item.get("summary", ""),
+                item.get("description", ""),
+                item.get("help", ""),
+            ]
+
+    html = {}
+    for text in texts:
+        if text:
+            html[_markdown_key(text)] = _convert_markdown(text)
+
+    fname = fname or _resource("markdown.json")
+
+    with open(fname, "w") as f:
+        json.dump({
+            "version": markdown.__version__,
+            "html": html,
+        }, f, indent=4, sort_keys=True)
+
+    self._markdown_html = None  # Load anew on next render
+    return fname
+
+
 with open(_resource("ui", "style.css")) as f:
     stylesheet = f.read()
 
@@ -765,8 +922,7 @@ class HelpPage(QtWidgets.QWidget):
         opacity.setOpacity(0.5)
         widgets["background"].setGraphicsEffect(opacity)
 
-        icon = _resource("icons", "back.png")
-        icon = QtGui.QIcon(icon)
+        icon = _icon("icons", "back.png")
         widgets["back"].setIcon(icon)
         widgets["back"].clicked.connect(self.on_back)
 
@@ -792,11 +948,7 @@ class HelpPage(QtWidgets.QWidget):
         layout.addWidget(QtWidgets.QWidget(), 1)  # Push everything up
         layout.setSpacing(px(20))
 
-        pixmap = _resource("ui", "ragdoll_silhouette_white_128.png")
-        pixmap = QtGui.QPixmap(pixmap)
-        pixmap = pixmap.scaledToWidth(
-            px(32), QtCore.Qt.SmoothTransformation
-        )
+        pixmap = _pixmap("ui", "ragdoll_silhouette_white_128.png", width=32)
         widgets["logo"].setPixmap(pixmap)
 
         for label in (widgets["summary"], widgets["description"]):
@@ -857,13 +1009,10 @@ class HelpPage(QtWidgets.QWidget):
         media = item.get("media", [])
 
         # Pre-process any contained markdown
-        summary = markdown.markdown(summary)
-        description = markdown.markdown(description)
+        summary = render_markdown(summary)
+        description = render_markdown(description)
 
-        pixmap = QtGui.QPixmap(_resource("icons", icon))
-        pixmap = pixmap.scaledToWidth(
-            px(20), QtCore.Qt.SmoothTransformation
-        )
+        pixmap = _pixmap("icons", icon, width=20)
 
         self._widgets["title"].setText(label)
         self._widgets["icon"].setPixmap(pixmap)
@@ -1280,7 +1429,7 @@ class Options(QtWidgets.QMainWindow):
         )
 
     def on_entered(self, arg):
-        text = markdown.markdown(arg["help"])
+        text = render_markdown(arg["help"])
         self._widgets["Hint"].setText(text)
 
     def on_exited(self, arg=None):
@@ -1311,7 +1460,7 @@ def MessageBox(title, text, buttons=None, icon=QuestionIcon):
     message.setIcon(icon)
 
     message.setWindowTitle(title)
-    message.setText(markdown.markdown(text))
+    message.setText(render_markdown(text, remember=False))
 
     return message.exec_() == QtWidgets.QMessageBox.Yes
 
@@ -1939,7 +2088,8 @@ class Explorer(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         self.setMinimumWidth(px(200))
         self.setMinimumHeight(px(100))
 
-        model = qjsonmodel.QJsonModel(editable=False)
+        # Only create what is expanded, dumps can be large
+        model = qjsonmodel.QJsonModel(editable=False, lazy=True)
 
         view = QtWidgets.QTreeView()
         view.setModel(model)
@@ -1951,15 +2101,19 @@ class Explorer(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         debug = QtWidgets.QCheckBox("Show Debug")
         debug.stateChanged.connect(self.on_debug_changed)
 
+        live = QtWidgets.QCheckBox("Live")
+        live.stateChanged.connect(self.on_live_changed)
+
         refresh = QtWidgets.QPushButton("Refresh")
         refresh.clicked.connect(self.reload)
 
         layout = QtWidgets.QGridLayout(self)
-        layout.addWidget(view, 0, 0, 1, 3)
+        layout.addWidget(view, 0, 0, 1, 4)
         layout.addWidget(QtWidgets.QWidget(), 1, 0)
-        layout.addWidget(raw, 1, 1)
-        layout.addWidget(debug, 1, 2)
-        layout.addWidget(refresh, 2, 0, 1, 3)
+        layout.addWidget(live, 1, 1)
+        layout.addWidget(raw, 1, 2)
+        layout.addWidget(debug, 1, 3)
+        layout.addWidget(refresh, 2, 0, 1, 4)
         layout.setColumnStretch(0, 1)
 
         timer = QtCore.QTimer(parent=self)  # Delete on close
@@ -1972,6 +2126,7 @@ class Explorer(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         self._dump = None
         self._raw = False
         self._debug = False
+        self._loaded = False
 
         Explorer.instance = self
 
@@ -1986,6 +2141,12 @@ class Explorer(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         self._debug = bool(state)
         self.reload()
 
+    def on_live_changed(self, state):
+        if state:
+            self._timer.start()
+        else:
+            self._timer.stop()
+
     def parse(self, dump, raw=False):
         if self._raw:
             dump["entities"] = {
@@ -2028,12 +2189,9 @@ class Explorer(MayaQWidgetDockableMixin, QtWidgets.QDialog):
 
     def load(self, dump):
         self._dump = dump
+        self._loaded = False
         self.reload()
 
-        # Need to implement updating of individual fields,
-        # in order to not loose selection and navigation
-        # self._timer.start()
-
     def reload(self):
         assert self._dump is not None, "Call load() first"
         dump = self._dump
@@ -2047,8 +2205,18 @@ class Explorer(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         assert isinstance(dump, dict)
 
         parsed = self.parse(dump)
-        self._model.load(parsed)
-        self._view.expandToDepth(0)
+
+        with i__.Timer() as t:
+            if self._loaded:
+                # Only update what changed, keeping selection and expansion
+                self._model.reload(parsed)
+
+            else:
+                self._model.load(parsed)
+                self._view.expandToDepth(0)
+                self._loaded = True
+
+        log.debug("Explorer.reload: %.2fms" % t.ms)
 
 
 EntityRole = QtCore.Qt.UserRole + 0
@@ -2084,6 +2252,9 @@ class DumpWidget(QtWidgets.QWidget):
         super(DumpWidget, self).__init__(parent)
         self.setAttribute(QtCore.Qt.WA_StyledBackground)
 
+        # Each entity gets a few, and there can be thousands of entities
+        _preload_icons()
+
         panels = {
             "Body": QtWidgets.QWidget(),
         }
@@ -2106,9 +2277,6 @@ class DumpWidget(QtWidgets.QWidget):
 
         # Setup
 
-        pixmap = _resource("icons", "right.png")
-        pixmap = QtGui.QPixmap(pixmap)
-        pixmap = pixmap.scaledToWidth(px(16), QtCore.Qt.SmoothTransformation)
         widgets["TargetView"].mouseMoved.connect(self.on_mouse_moved)
         widgets["TargetView"].setModel(models["TargetModel"])
         widgets["TargetView"].setUniformRowHeights(True)
@@ -2221,8 +2389,7 @@ class DumpWidget(QtWidgets.QWidget):
                     "nurbsSurface": "maya_surface.png",
                 }.get(shape_icon, "maya_transform.png")
 
-                shape_icon = _resource("icons", shape_icon)
-                shape_icon = QtGui.QIcon(shape_icon)
+                shape_icon = _icon("icons", shape_icon)
 
             occupied = entity in analysis["occupied"]
             no_transform = entity not in analysis["entityToTransform"]
@@ -2233,8 +2400,7 @@ class DumpWidget(QtWidgets.QWidget):
 
             if occupied:
                 # Dim any transform that isn't getting imported
-                icon = _resource("icons", "check.png")
-                icon = QtGui.QIcon(icon)
+                icon = _icon("icons", "check.png")
 
                 occupied = analysis["entityToTransform"][entity]
                 path = occupied.shortestPath()
@@ -2252,15 +2418,13 @@ class DumpWidget(QtWidgets.QWidget):
                 # There isn't any transform for this entity
                 if options.read("importCreateMissingTransforms"):
                     data[QtCore.Qt.DisplayRole] += ["New"]
-                    icon = _resource("icons", "add.png")
-                    icon = QtGui.QIcon(icon)
+                    icon = _icon("icons", "add.png")
                     tooltip = "A new transform will be created for this marker"
 
                 else:
                     data[QtCore.Qt.ForegroundRole] = (color, color)
                     data[QtCore.Qt.DisplayRole] += [term]
-                    icon = _resource("icons", "questionmark.png")
-                    icon = QtGui.QIcon(icon)
+                    icon = _icon("icons", "questionmark.png")
                     tooltip = (
                         "<b>%s</b> - could not be found in the scene" % term
                     )
@@ -2269,8 +2433,7 @@ class DumpWidget(QtWidgets.QWidget):
                 data[HintRole] += [tooltip]
 
             else:
-                icon = _resource("icons", "right.png")
-                icon = QtGui.QIcon(icon)
+                icon = _icon("icons", "right.png")
                 transform = analysis["entityToTransform"][entity]
 
                 # These paths can get *quite* long, so help the user
@@ -2300,8 +2463,7 @@ class DumpWidget(QtWidgets.QWidget):
                 "marker.png"
             )
 
-            icon = _resource("icons", icon)
-            icon = QtGui.QIcon(icon)
+            icon = _icon("icons", icon)
 
             data[QtCore.Qt.DecorationRole] += [icon]
 
@@ -2334,8 +2496,7 @@ class DumpWidget(QtWidgets.QWidget):
             for entity in analysis["solvers"]:
                 Name = self._loader.registry.get(entity, "NameComponent")
                 label = Name["path"].rsplit("|", 1)[-1]
-                icon = _resource("icons", "solver.png")
-                icon = QtGui.QIcon(icon)
+                icon = _icon("icons", "solver.png")
 
                 data = _default_data(entity)
                 data[QtCore.Qt.DecorationRole] += [icon]
@@ -2355,8 +2516,7 @@ class DumpWidget(QtWidgets.QWidget):
             for entity in analysis["groups"]:
                 Name = self._loader.registry.get(entity, "NameComponent")
                 label = Name["path"].rsplit("|", 1)[-1]
-                icon = _resource("icons", "suit.png")
-                icon = QtGui.QIcon(icon)
+                icon = _icon("icons", "suit.png")
 
                 data = _default_data(entity)
                 data[QtCore.Qt.DecorationRole] += [icon]
@@ -2423,25 +2583,24 @@ class DumpWidget(QtWidgets.QWidget):
                 label = Name["path"].rsplit("|", 1)[-1]
 
                 if registry.has(entity, "FixedJointComponent"):
-                    icon = _resource("icons", "fixed_constraint.png")
+                    icon = "fixed_constraint.png"
                     target = "New Weld Constraint"
 
                 elif registry.has(entity, "DistanceJointComponent"):
-                    icon = _resource("icons", "distance.png")
+                    icon = "distance.png"
                     target = "New Distance Constraint"
 
                 elif registry.has(entity, "PinJointComponent"):
-                    icon = _resource("icons", "softpin.png")
+                    icon = "softpin.png"
                     target = "New Pin Constraint"
 
                 else:
-                    icon = _resource("icons", "constraint.png")
+                    icon = "constraint.png"
                     target = "New Constraint"
 
-                icon = QtGui.QIcon(icon)
+                icon = _icon("icons", icon)
 
-                right_icon = _resource("icons", "right.png")
-                right_icon = QtGui.QIcon(right_icon)
+                right_icon = _icon("icons", "right.png")
 
                 data = _default_data(entity)
                 data[QtCore.Qt.DecorationRole] += [icon, right_icon]
@@ -2472,8 +2631,7 @@ class DumpWidget(QtWidgets.QWidget):
         })
 
         if not self._loader.is_valid():
-            icon = _resource("icons", "error.png")
-            icon = QtGui.QIcon(icon)
+            icon = _icon("icons", "error.png")
             invalid_item = qargparse.GenericTreeModelItem({
                 QtCore.Qt.DisplayRole: "Empty or incompatible .rag file",
                 QtCore.Qt.DecorationRole: icon,
@@ -2496,8 +2654,7 @@ class DumpWidget(QtWidgets.QWidget):
             self._widgets["TargetView"].setIndentation(px(11))
 
         if all_items == {}:
-            icon = _resource("icons", "error.png")
-            icon = QtGui.QIcon(icon)
+            icon = _icon("icons", "error.png")
             invalid_item = qargparse.GenericTreeModelItem({
                 QtCore.Qt.DisplayRole: "No Markers found in .rag file",
                 QtCore.Qt.DecorationRole: icon,
@@ -2612,12 +2769,8 @@ class ImportOptions(Options):
         search_replace.changed.connect(self.reset)
         create_missing.changed.connect(self.reset)
 
-        default_thumbnail = _resource("icons", "no_thumbnail.png")
-        default_thumbnail = QtGui.QPixmap(default_thumbnail)
-        default_thumbnail = default_thumbnail.scaled(
-            px(200), px(128),
-            QtCore.Qt.KeepAspectRatio,
-            QtCore.Qt.SmoothTransformation
+        default_thumbnail = _pixmap(
+            "icons", "no_thumbnail.png", width=200, height=128
         )
 
         # Add a thumbnail next to the import paths
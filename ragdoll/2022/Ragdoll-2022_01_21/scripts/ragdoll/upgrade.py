@@ -15,8 +15,10 @@ compatibility path for all time.
 """
 
 import os
+import time
 import logging
 import traceback
+import collections
 
 from maya import cmds
 from . import constants, internal
@@ -29,7 +31,20 @@ RAGDOLL_PLUGIN_NAME = os.path.basename(RAGDOLL_PLUGIN)
 
 
 @internal.with_undo_chunk
-def upgrade_all():
+def upgrade_all(transactional=False):
+    """Upgrade every Ragdoll node in the scene
+
+    Arguments:
+        transactional (bool, optional): Perform every upgrade step of every
+            node in one modifier, committed as one undo entry. Any failure
+            rolls back all changes and is re-raised, rather than skipping
+            the offending node. Default False
+
+    Returns:
+        count (int): Number of nodes upgraded
+
+    """
+
     print("Updating..")
 
     # Also fetch plug-in version from the same mouth, rather
@@ -41,6 +56,27 @@ def upgrade_all():
     # Debug builds come with a `.debug` suffix, e.g. `2020.10.15.debug`
     current_version = int("".join(version_str.split(".")[:3]))
 
+    _timings.clear()
+
+    try:
+        if not transactional:
+            return _upgrade_all(None, current_version)
+
+        with cmdx.DagModifier(debug=False) as mod:
+            try:
+                return _upgrade_all(mod, current_version)
+
+            except Exception:
+                # Steps are performed as they go, so that each may read
+                # what the previous one wrote. Take them all back.
+                mod.undo_it()
+                raise
+
+    finally:
+        _report_timings()
+
+
+def _upgrade_all(mod, current_version):
     nodetype_to_upgrade = (
         ("rdScene", scene),
         ("rdRigid", rigid),
@@ -62,23 +98,70 @@ def upgrade_all():
                 continue
 
             try:
-                upgraded = func(node, node_version, current_version)
+                upgraded = func(node, node_version, current_version, mod)
 
             except Exception as e:
+                if mod is not None:
+                    raise
+
                 log.debug(traceback.format_exc())
                 log.warning(e)
                 log.warning("Bug, had trouble upgrading")
                 continue
 
             else:
-                if upgraded:
-                    upgraded_count += 1
-                    with cmdx.DGModifier() as mod:
-                        mod.set_attr(node["version"], current_version)
+                if not upgraded:
+                    continue
+
+                upgraded_count += 1
+
+                if mod is not None:
+                    mod.set_attr(node["version"], current_version)
+                else:
+                    with cmdx.DGModifier() as mod_:
+                        mod_.set_attr(node["version"], current_version)
 
     return upgraded_count
 
 
+# Accumulated (count, seconds) per upgrade step, from the last upgrade_all()
+_timings = collections.OrderedDict()
+
+
+def _step(func, node, mod=None):
+    """Apply upgrade step `func` to `node`
+
+    Each step is given a modifier of its own, unless `mod` is provided
+    in which case it is performed immediately as part of `mod` such
+    that subsequent steps see its result.
+
+    """
+
+    t0 = time.time()
+
+    try:
+        if mod is None:
+            with cmdx.DagModifier() as mod:
+                func(mod, node)
+        else:
+            func(mod, node)
+            mod.do_it()
+
+    finally:
+        count, duration = _timings.get(func.__name__, (0, 0.0))
+        _timings[func.__name__] = (count + 1, duration + time.time() - t0)
+
+
+def _report_timings():
+    total = sum(duration for _, duration in _timings.values())
+
+    for name, (count, duration) in _timings.items():
+        log.info("%s: %d nodes in %.2fms" % (name, count, duration * 1000))
+
+    if _timings:
+        log.info("Upgraded in %.2fms" % (total * 1000))
+
+
 def needs_upgrade():
     version_str = cmds.pluginInfo(constants.RAGDOLL_PLUGIN_NAME,
                                   query=True, version=True)
@@ -92,8 +175,13 @@ def needs_upgrade():
     # Evaluate all node types defined by Ragdoll
     all_nodetypes = cmds.pluginInfo("ragdoll", query=True, dependNode=True)
 
-    for node in cmdx.ls(type=all_nodetypes):
-        node_version = node["version"].read()
+    # Read every version in one pass
+    snapshot = cmdx.Snapshot(all_nodetypes, attributes=("version",))
+    log.debug("Scanned %d nodes in %.2f ms" % (
+        len(snapshot), snapshot.duration * 1000))
+
+    for node in snapshot:
+        node_version = snapshot.read(node, "version", version)
 
         if has_upgrade(node, node_version):
             needs_upgrade += 1
@@ -130,7 +218,7 @@ def has_upgrade(node, from_version):
         return from_version < 20211129
 
 
-def scene(node, from_version, to_version):
+def scene(node, from_version, to_version, mod=None):
     if from_version <= 0:
         # Saved with a development version
         return
@@ -138,21 +226,21 @@ def scene(node, from_version, to_version):
     upgraded = False
 
     if from_version < 20201015:
-        _scene_00000000_20201015(node)
+        _step(_scene_00000000_20201015, node, mod)
         upgraded = True
 
     if from_version < 20210228:
-        _scene_20201016_20210228(node)
+        _step(_scene_20201016_20210228, node, mod)
         upgraded = True
 
     if from_version < 20210313:
-        _scene_20201015_20210313(node)
+        _step(_scene_20201015_20210313, node, mod)
         upgraded = True
 
     return upgraded
 
 
-def rigid(node, from_version, to_version):
+def rigid(node, from_version, to_version, mod=None):
     if from_version <= 0:
         # Saved with a development version
         return
@@ -160,91 +248,91 @@ def rigid(node, from_version, to_version):
     upgraded = False
 
     if from_version < 20201015:
-        _rigid_00000000_20201015(node)
+        _step(_rigid_00000000_20201015, node, mod)
         upgraded = True
 
     elif from_version < 20201016:
-        _rigid_20201015_20201016(node)
+        _step(_rigid_20201015_20201016, node, mod)
         upgraded = True
 
     if from_version < 20210228:
-        _rigid_20201016_20210228(node)
+        _step(_rigid_20201016_20210228, node, mod)
         upgraded = True
 
     if from_version < 20210308:
-        _rigid_20210228_20210308(node)
+        _step(_rigid_20210228_20210308, node, mod)
         upgraded = True
 
     if from_version < 20210423:
-        _rigid_20210423_20210427(node)
+        _step(_rigid_20210423_20210427, node, mod)
         upgraded = True
 
     return upgraded
 
 
-def rigid_multiplier(node, from_version, to_version):
+def rigid_multiplier(node, from_version, to_version, mod=None):
     upgraded = False
 
     if from_version < 20210411:
-        _rigid_multiplier_20210308_20210411(node)
+        _step(_rigid_multiplier_20210308_20210411, node, mod)
         upgraded = True
 
     return upgraded
 
 
-def constraint_multiplier(node, from_version, to_version):
+def constraint_multiplier(node, from_version, to_version, mod=None):
     upgraded = False
 
     if from_version < 20210411:
-        _constraint_multiplier_20210308_20210411(node)
+        _step(_constraint_multiplier_20210308_20210411, node, mod)
         upgraded = True
 
     return upgraded
 
 
-def marker(node, from_version, to_version):
+def marker(node, from_version, to_version, mod=None):
     upgraded = False
 
     if from_version < 20211007:
-        _marker_20210928_20211007(node)
+        _step(_marker_20210928_20211007, node, mod)
         upgraded = True
 
     if from_version < 20211129:
-        _marker_20211007_20211129(node)
+        _step(_marker_20211007_20211129, node, mod)
         upgraded = True
 
     return upgraded
 
 
-def group(node, from_version, to_version):
+def group(node, from_version, to_version, mod=None):
     upgraded = False
 
     if from_version < 20211007:
-        _group_20210928_20211007(node)
+        _step(_group_20210928_20211007, node, mod)
         upgraded = True
 
     return upgraded
 
 
-def solver(node, from_version, to_version):
+def solver(node, from_version, to_version, mod=None):
     upgraded = False
 
     if from_version < 20211007:
-        _solver_20210928_20211007(node)
+        _step(_solver_20210928_20211007, node, mod)
         upgraded = True
 
     if from_version < 20211024:
-        _solver_20210928_20211024(node)
+        _step(_solver_20210928_20211024, node, mod)
         upgraded = True
 
     if from_version < 20211112:
-        _solver_20211024_20211112(node)
+        _step(_solver_20211024_20211112, node, mod)
         upgraded = True
 
     return upgraded
 
 
-def canvas(node, from_version, to_version):
+def canvas(node, from_version, to_version, mod=None):
     upgraded = False
 
     return upgraded
@@ -257,43 +345,42 @@ Individual upgrade paths
 """
 
 
-def _scene_00000000_20201015(node):
+def _scene_00000000_20201015(mod, node):
     """TGS was introduced, let's maintain backwards compatibility though"""
     log.info("Upgrading %s to 2020.10.15" % node)
-    node["solverType"] = constants.PGSSolverType
+    mod.set_attr(node["solverType"], constants.PGSSolverType)
 
 
-def _scene_20201015_20210313(node):
+def _scene_20201015_20210313(mod, node):
     """Support for Z-up got added"""
     log.info("Upgrading %s to 2021.03.13" % node)
 
     up = cmdx.up_axis()
 
-    with cmdx.DagModifier() as mod:
-        if up.y:
-            mod.set_nice_name(node["gravityY"], "Gravity")
-            mod.set_keyable(node["gravityY"])
-        else:
-            mod.set_nice_name(node["gravityZ"], "Gravity")
-            mod.set_keyable(node["gravityZ"])
+    if up.y:
+        mod.set_nice_name(node["gravityY"], "Gravity")
+        mod.set_keyable(node["gravityY"])
+    else:
+        mod.set_nice_name(node["gravityZ"], "Gravity")
+        mod.set_keyable(node["gravityZ"])
 
 
-def _rigid_00000000_20201015(node):
+def _rigid_00000000_20201015(mod, node):
     """Introduced the .restMatrix"""
     log.info("Upgrading %s to 2020.10.15" % node)
 
     if "restMatrix" in node and node["restMatrix"].editable:
         rest = node["inputMatrix"].asMatrix()
-        cmds.setAttr(node["restMatrix"].path(), tuple(rest), type="matrix")
+        mod.set_attr(node["restMatrix"], rest)
 
 
-def _rigid_20201015_20201016(node):
+def _rigid_20201015_20201016(mod, node):
     """Introduced .color"""
     log.info("Upgrading %s to 2020.10.16" % node)
-    node["color"] = internal.random_color()
+    mod.set_attr(node["color"], internal.random_color())
 
 
-def _scene_20201016_20210228(scene):
+def _scene_20201016_20210228(mod, scene):
     """Array indices are automatically removed since 02-28
 
     There remains support for unconnected indices with references to
@@ -314,144 +401,134 @@ def _scene_20201016_20210228(scene):
         "inputSliceStart",
     ]
 
-    with cmdx.DGModifier() as mod:
-        for attr in array_attributes:
-            for element in scene[attr]:
-                if element.connected:
-                    continue
+    for attr in array_attributes:
+        for element in scene[attr]:
+            if element.connected:
+                continue
 
-                mod._modifier.removeMultiInstance(element._mplug, True)
+            mod._modifier.removeMultiInstance(element._mplug, True)
 
 
-def _rigid_20201016_20210228(rigid):
+def _rigid_20201016_20210228(mod, rigid):
     """Introduced .cachedRestMatrix"""
     log.info("Upgrading %s to 2021.02.28" % rigid)
 
-    with cmdx.DagModifier() as mod:
-        rest = rigid["restMatrix"].asMatrix()
-        mod.set_attr(rigid["cachedRestMatrix"], rest)
+    rest = rigid["restMatrix"].asMatrix()
+    mod.set_attr(rigid["cachedRestMatrix"], rest)
 
-        if not rigid["restMatrix"].connected:
-            parent = rigid.parent()
-            mod.connect(parent["worldMatrix"][0],
-                        rigid["restMatrix"])
+    if not rigid["restMatrix"].connected:
+        parent = rigid.parent()
+        mod.connect(parent["worldMatrix"][0],
+                    rigid["restMatrix"])
 
 
-def _rigid_20210228_20210308(rigid):
+def _rigid_20210228_20210308(mod, rigid):
     """Introduced .startTime"""
     log.info("Upgrading %s to 2021.03.08" % rigid)
 
     scene = rigid["nextState"].connection(type="rdScene")
+    mod.connect(scene["startTime"], rigid["startTime"])
 
-    with cmdx.DagModifier() as mod:
-        mod.connect(scene["startTime"], rigid["startTime"])
 
-
-def _rigid_20210423_20210427(rigid):
+def _rigid_20210423_20210427(mod, rigid):
     """Introduced .startTime"""
     log.info("Upgrading %s to 2021.04.27" % rigid)
 
-    with cmdx.DagModifier() as mod:
-        mod.set_attr(rigid["creationMatrix"],
-                     rigid["cachedRestMatrix"].as_matrix())
+    mod.set_attr(rigid["creationMatrix"],
+                 rigid["cachedRestMatrix"].as_matrix())
 
 
-def _constraint_multiplier_20210308_20210411(mult):
+def _constraint_multiplier_20210308_20210411(mod, mult):
     log.info("Upgrading %s to 2021.04.11" % mult)
 
-    with cmdx.DagModifier() as mod:
-        others = mult["message"].connections(type="rdConstraint",
-                                             source=False,
-                                             plugs=True)
-        for index, other in enumerate(others):
-            mod.connect(mult["ragdollId"], other)
+    others = mult["message"].connections(type="rdConstraint",
+                                         source=False,
+                                         plugs=True)
+    for index, other in enumerate(others):
+        mod.connect(mult["ragdollId"], other)
 
 
-def _rigid_multiplier_20210308_20210411(mult):
+def _rigid_multiplier_20210308_20210411(mod, mult):
     log.info("Upgrading %s to 2021.04.11" % mult)
 
-    with cmdx.DagModifier() as mod:
-        others = mult["message"].connections(type="rdRigid",
-                                             source=False,
-                                             plugs=True)
-        for index, other in enumerate(others):
-            mod.connect(mult["ragdollId"], other)
+    others = mult["message"].connections(type="rdRigid",
+                                         source=False,
+                                         plugs=True)
+    for index, other in enumerate(others):
+        mod.connect(mult["ragdollId"], other)
 
 
-def _solver_20210928_20211007(solver):
+def _solver_20210928_20211007(mod, solver):
     log.info("Upgrading %s to 2021.10.07" % solver)
 
-    with cmdx.DagModifier() as mod:
-        # Used to be a number, is now an enum
-        start_time = solver["startTime"].read()
-        start_time = cmdx.om.MTime(start_time, cmdx.TimeUiUnit())
-        mod.set_attr(solver["startTimeCustom"], start_time)
-        mod.set_attr(solver["startTime"], 2)  # Custom
+    # Used to be a number, is now an enum
+    start_time = solver["startTime"].read()
+    start_time = cmdx.om.MTime(start_time, cmdx.TimeUiUnit())
+    mod.set_attr(solver["startTimeCustom"], start_time)
+    mod.set_attr(solver["startTime"], 2)  # Custom
 
-        # The transform wasn't connected, but now it should be
-        transform = solver.parent()
-        mod.connect(transform["worldMatrix"][0], solver["inputMatrix"])
+    # The transform wasn't connected, but now it should be
+    transform = solver.parent()
+    mod.connect(transform["worldMatrix"][0], solver["inputMatrix"])
 
 
-def _solver_20210928_20211024(solver):
+def _solver_20210928_20211024(mod, solver):
     log.info("Upgrading %s to 2021.10.24" % solver)
 
 
-def _solver_20211024_20211112(solver):
+def _solver_20211024_20211112(mod, solver):
     """rdCanvas node was added"""
     log.info("Upgrading %s to 2021.11.12" % solver)
 
-    with cmdx.DagModifier() as mod:
-        parent = solver.parent()
-        canvas = mod.create_node("rdCanvas",
-                                 name="rCanvasShape",
-                                 parent=parent)
+    parent = solver.parent()
+    canvas = mod.create_node("rdCanvas",
+                             name="rCanvasShape",
+                             parent=parent)
 
-        mod.set_attr(canvas["hiddenInOutliner"], True)
-        mod.set_attr(canvas["isHistoricallyInteresting"], False)
+    mod.set_attr(canvas["hiddenInOutliner"], True)
+    mod.set_attr(canvas["isHistoricallyInteresting"], False)
 
-        mod.connect(solver["ragdollId"], canvas["solver"])
+    mod.connect(solver["ragdollId"], canvas["solver"])
 
 
-def _marker_20210928_20211007(marker):
+def _marker_20210928_20211007(mod, marker):
     log.info("Upgrading %s to 2021.10.07" % marker)
 
-    with cmdx.DagModifier() as mod:
-        # driveSpace turned into an enum
-        if "driveSpace" in marker:
-            custom = marker["driveSpace"].read()
-            mod.set_attr(marker["driveSpaceCustom"], custom)
+    # driveSpace turned into an enum
+    if "driveSpace" in marker:
+        custom = marker["driveSpace"].read()
+        mod.set_attr(marker["driveSpaceCustom"], custom)
 
-            space = constants.GuideInherit
+        space = constants.GuideInherit
 
-            if custom < -0.99:
-                space = constants.GuideLocal
+        if custom < -0.99:
+            space = constants.GuideLocal
 
-            if custom > 0.99:
-                space = constants.GuideWorld
+        if custom > 0.99:
+            space = constants.GuideWorld
 
-            mod.set_attr(marker["driveSpace"], space)
+        mod.set_attr(marker["driveSpace"], space)
 
-        # offsetMatrix was introduced
-        if "offsetMatrix" in marker:
-            for index, dst in enumerate(marker["dst"]):
-                src = marker["src"].input(type=("transform", "joint"))
-                dst = dst.input(type=("transform", "joint"))
+    # offsetMatrix was introduced
+    if "offsetMatrix" in marker:
+        for index, dst in enumerate(marker["dst"]):
+            src = marker["src"].input(type=("transform", "joint"))
+            dst = dst.input(type=("transform", "joint"))
 
-                if not dst:
-                    # An untargeted marker, leave it
-                    continue
+            if not dst:
+                # An untargeted marker, leave it
+                continue
 
-                if not src:
-                    # This would be odd, but technically possible
-                    continue
+            if not src:
+                # This would be odd, but technically possible
+                continue
 
-                offset = src["worldMatrix"][0].as_matrix()
-                offset *= dst["worldInverseMatrix"][0].as_matrix()
-                mod.set_attr(marker["offsetMatrix"][index], offset)
+            offset = src["worldMatrix"][0].as_matrix()
+            offset *= dst["worldInverseMatrix"][0].as_matrix()
+            mod.set_attr(marker["offsetMatrix"][index], offset)
 
 
-def _marker_20211007_20211129(marker):
+def _marker_20211007_20211129(mod, marker):
     """originMatrix was added
 
     Since we can't go back in time to find out what pose they were
@@ -464,19 +541,17 @@ def _marker_20211007_20211129(marker):
 
     log.info("Upgrading %s to 2021.11.29" % marker)
 
-    with cmdx.DagModifier() as mod:
-        mod.set_attr(marker["originMatrix"], marker["inputMatrix"].as_matrix())
+    mod.set_attr(marker["originMatrix"], marker["inputMatrix"].as_matrix())
 
 
-def _group_20210928_20211007(group):
+def _group_20210928_20211007(mod, group):
     log.info("Upgrading %s to 2021.10.07" % group)
 
-    with cmdx.DagModifier() as mod:
-        for index, oldstart in enumerate(group["inputMarkerStart"]):
-            marker = oldstart.input()
-            mod.connect(marker["startState"], group["inputStart"][index])
-            mod.connect(marker["currentState"], group["inputCurrent"][index])
-            mod.disconnect(oldstart)
+    for index, oldstart in enumerate(group["inputMarkerStart"]):
+        marker = oldstart.input()
+        mod.connect(marker["startState"], group["inputStart"][index])
+        mod.connect(marker["currentState"], group["inputCurrent"][index])
+        mod.disconnect(oldstart)
 
-        for oldcurrent in group["inputMarker"]:
-            mod.disconnect(oldcurrent)
+    for oldcurrent in group["inputMarker"]:
+        mod.disconnect(oldcurrent)